@@ -0,0 +1,91 @@
+"""
+Microbenchmark for the automod message analysis path
+
+Compares the old per-check analysis (re-lowercasing per check, a substring
+scan per bad word and a generator over every character for caps) with a
+shared MessageProfile plus the compiled WordMatcher.
+
+Run from the repository root:
+    python benchmarks/automod_profile.py [--messages N] [--words N]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.matcher import WordMatcher
+from utils.message_profile import MessageProfile
+
+
+def make_words(count: int, rng: random.Random) -> list:
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(count)]
+
+
+def make_messages(count: int, rng: random.Random) -> list:
+    messages = []
+    for _ in range(count):
+        words = [''.join(rng.choices(string.ascii_letters, k=rng.randint(2, 9))) for _ in range(rng.randint(3, 40))]
+        if rng.random() < 0.1:
+            words = [w.upper() for w in words]
+        messages.append((' '.join(words), rng.randint(0, 7)))
+    return messages
+
+
+def analyze_before(content: str, mention_count: int, bad_words: list) -> bool:
+    """The analysis each check performed on its own before profiles existed"""
+    content_lower = content.lower()
+    for bad_word in bad_words:
+        if bad_word in content_lower:
+            return True
+    if len(content) >= 10:
+        caps_count = sum(1 for c in content if c.isupper())
+        if caps_count / len(content) > 0.7:
+            return True
+    return mention_count > 5
+
+
+def analyze_after(content: str, mention_count: int, matcher: WordMatcher) -> bool:
+    """Shared profile evaluated cheapest check first"""
+    profile = MessageProfile(content, mention_count)
+    if profile.mention_count > 5:
+        return True
+    if profile.length >= 10 and profile.caps_ratio > 0.7:
+        return True
+    return matcher.search(profile.normalized) is not None
+
+
+def run(label: str, func, messages: list, arg) -> float:
+    start = time.perf_counter()
+    hits = 0
+    for content, mentions in messages:
+        hits += func(content, mentions, arg)
+    elapsed = time.perf_counter() - start
+    rate = len(messages) / elapsed
+    print(f"{label:<8} {rate:>12,.0f} msg/s  ({hits} flagged)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=20_000)
+    parser.add_argument('--words', type=int, default=1_000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bad_words = make_words(args.words, rng)
+    messages = make_messages(args.messages, rng)
+    matcher = WordMatcher(bad_words)
+
+    print(f"{args.messages} messages, {args.words} bad words")
+    before = run('before', analyze_before, messages, bad_words)
+    after = run('after', analyze_after, messages, matcher)
+    print(f"speedup  {after / before:>12.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Offline replay benchmark for the AutoModeration cog
+
+Feeds a synthetic or recorded corpus of message-like objects through
+AutoModeration.moderate, the cog's message pipeline stage, against stub
+channels that count REST calls instead of making them, then reports
+throughput, per-check latency percentiles and memory allocations.
+
+A recorded corpus is a JSON-lines file with one object per message:
+    {"content": "...", "author": 123, "channel": 456, "guild": 1, "mentions": 0, "t": 1700000000.0}
+
+Run from the repository root:
+    python benchmarks/automod_replay.py [--messages N] [--corpus FILE] [--allocations]
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+from discord.ext import commands
+
+CHECKS = (
+    'check_mass_mentions', 'check_caps', 'check_bad_words',
+    'check_spam', 'check_flood', 'check_near_duplicates',
+)
+
+_message_ids = itertools.count(1)
+
+
+class StubChannel:
+    """Text channel stand-in that counts REST calls"""
+
+    def __init__(self, channel_id: int, rest: dict):
+        self.id = channel_id
+        self.rest = rest
+
+    async def send(self, *args, **kwargs):
+        self.rest['send'] += 1
+
+    async def delete_messages(self, messages):
+        self.rest['bulk_delete'] += 1
+
+    def __str__(self):
+        return f"#{self.id}"
+
+
+class StubGuild:
+    def __init__(self, guild_id: int, rest: dict):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.rest = rest
+        self.channels = {}
+
+    def get_channel(self, channel_id: int):
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            channel = self.channels[channel_id] = StubChannel(channel_id, self.rest)
+        return channel
+
+    def __str__(self):
+        return self.name
+
+
+class StubAuthor:
+    bot = False
+    roles = ()
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+
+    def __str__(self):
+        return f"user-{self.id}"
+
+
+class StubMessage:
+    def __init__(self, content: str, author, channel, guild, timestamp: float, mentions: int):
+        self.id = next(_message_ids)
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+        self.mentions = [StubAuthor(-i) for i in range(mentions)]
+        self.created_at = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        self.rest = guild.rest
+
+    async def delete(self):
+        self.rest['delete'] += 1
+
+
+def synthetic_corpus(count: int, seed: int) -> list:
+    """Mostly ordinary chatter with caps, bad words, spam bursts and raid copypasta mixed in"""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2_000)]
+    raid_text = "free nitro for everyone who joins our server today, just click the link in my bio"
+    records = []
+    now = 1_700_000_000.0
+    while len(records) < count:
+        now += rng.expovariate(50)
+        roll = rng.random()
+        guild = rng.randint(1, 20)
+        record = {'guild': guild, 'channel': guild * 100 + rng.randint(0, 9),
+                  'author': rng.randint(1, 5_000), 'mentions': 0, 't': now}
+        if roll < 0.02:
+            # Spam burst from one user
+            for i in range(8):
+                records.append(dict(record, content=f"spam burst {i}", t=now + i * 0.2))
+            continue
+        if roll < 0.03:
+            # Raid: many accounts posting lightly edited copies across channels
+            for i in range(6):
+                records.append(dict(record, author=rng.randint(10_000, 20_000),
+                                    channel=guild * 100 + i % 4,
+                                    content=raid_text + "!" * i, t=now + i * 0.1))
+            continue
+        words = rng.choices(vocabulary, k=rng.randint(1, 30))
+        if roll < 0.08:
+            words = [w.upper() for w in words]
+        elif roll < 0.10:
+            words.append(rng.choice(['badword', 'sp4m', 'inappropriate']))
+        elif roll < 0.11:
+            record['mentions'] = rng.randint(6, 12)
+        record['content'] = ' '.join(words)
+        records.append(record)
+    return records[:count]
+
+
+def load_corpus(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def instrument(cog, timings: dict):
+    """Shadow each check on the cog instance with a timing wrapper"""
+    for name in CHECKS:
+        original = getattr(cog, name)
+        samples = timings[name] = []
+
+        async def timed(*args, _original=original, _samples=samples, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await _original(*args, **kwargs)
+            finally:
+                _samples.append(time.perf_counter() - start)
+
+        setattr(cog, name, timed)
+
+
+async def replay(records: list, track_allocations: bool):
+    from cogs.auto_moderation import AutoModeration
+    from utils.pipeline import MessageContext
+
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.default())
+    cog = AutoModeration(bot)
+    timings = {}
+    instrument(cog, timings)
+
+    rest = {'send': 0, 'delete': 0, 'bulk_delete': 0}
+    guilds = {}
+    authors = {}
+    messages = []
+    for record in records:
+        guild = guilds.get(record['guild'])
+        if guild is None:
+            guild = guilds[record['guild']] = StubGuild(record['guild'], rest)
+        author = authors.get(record['author'])
+        if author is None:
+            author = authors[record['author']] = StubAuthor(record['author'])
+        messages.append(StubMessage(record['content'], author, guild.get_channel(record['channel']),
+                                    guild, record['t'], record.get('mentions', 0)))
+
+    if track_allocations:
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+
+    start = time.perf_counter()
+    for message in messages:
+        await cog.moderate(MessageContext(message))
+    elapsed = time.perf_counter() - start
+
+    if track_allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().compare_to(baseline, 'filename')[:5]
+        tracemalloc.stop()
+
+    # Let pending notices flush so their sends are counted
+    await asyncio.sleep(cog.notices.delay + 0.1)
+    await cog.cog_unload()
+
+    print(f"{len(messages)} messages in {elapsed:.3f}s  ->  {len(messages) / elapsed:,.0f} msg/s")
+    print(f"REST calls: {rest['delete']} delete, {rest['bulk_delete']} bulk delete, {rest['send']} send")
+    print()
+    print(f"{'check':<24}{'calls':>8}{'p50 (us)':>12}{'p99 (us)':>12}{'max (us)':>12}")
+    for name in CHECKS:
+        samples = timings[name]
+        print(f"{name:<24}{len(samples):>8}"
+              f"{percentile(samples, 50) * 1e6:>12.1f}"
+              f"{percentile(samples, 99) * 1e6:>12.1f}"
+              f"{(max(samples) if samples else 0) * 1e6:>12.1f}")
+
+    if track_allocations:
+        print()
+        print(f"Allocations: {current / 1024:,.0f} KiB retained, {peak / 1024:,.0f} KiB peak")
+        for stat in top:
+            print(f"  {stat}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument('--corpus', help="replay a recorded JSON-lines corpus instead")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--allocations', action='store_true', help="track allocations with tracemalloc (slower)")
+    args = parser.parse_args()
+
+    records = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.messages, args.seed)
+    asyncio.run(replay(records, args.allocations))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,15 @@ from dotenv import load_dotenv
 import asyncio
 import subprocess
 from utils.logger import setup_logger
+from utils.pipeline import MessagePipeline, STAGE_MENTION_REPLY, STAGE_COMMANDS
+from utils.instrumentation import HandlerMetrics, LoopLagMonitor, instrument_cog
+from utils.metrics import MetricsServer
+from utils.health import HealthMonitor
+from utils.afk_index import AfkIndex
+from utils.database import Database
+from utils.overwrites import OverwriteEngine
+from utils.role_registry import RoleRegistry
+from config import WATCHDOG_HEARTBEAT_TIMEOUT, WATCHDOG_LOOP_LAG_LIMIT, WATCHDOG_STALL_GRACE, WATCHDOG_EXIT
 
 # Load environment variables
 load_dotenv()
@@ -24,9 +33,22 @@ prefix = os.getenv('PREFIX', 'V!')
 bot = commands.Bot(command_prefix=prefix, intents=intents)
 
 # Global storage
-bot.afk_users = {}
-bot.warning_count = {}
+bot.db = Database()  # Shared SQLite database (data/bot.db)
+bot.afk_index = AfkIndex(bot.db)  # Per-guild AFK records, loaded lazily and written behind
+bot.overwrites = OverwriteEngine()  # Shared channel overwrite sweeps for Muted/Quarantined roles
+bot.roles = RoleRegistry()  # Mute/quarantine/auto role IDs per guild (data/roles.json)
+bot.add_listener(bot.roles.on_guild_role_delete)
 bot.whitelisted_commands = ["afk", "help"]
+bot.handler_metrics = HandlerMetrics()
+bot.loop_lag = LoopLagMonitor()
+bot.message_pipeline = MessagePipeline(bot, metrics=bot.handler_metrics)
+bot.health = HealthMonitor(
+    bot,
+    heartbeat_timeout=WATCHDOG_HEARTBEAT_TIMEOUT,
+    lag_limit=WATCHDOG_LOOP_LAG_LIMIT,
+    stall_grace=WATCHDOG_STALL_GRACE,
+    exit_on_stall=WATCHDOG_EXIT
+)
 
 # FFmpeg check
 def ffmpeg_installed():
@@ -50,10 +72,35 @@ async def load_cogs():
                 logger.info(f"Loaded extension: {extension}")
             except Exception as e:
                 logger.error(f"Failed to load extension {extension}: {e}")
+    bot.health.cogs_loaded = True
+
+# Optional metrics and health endpoints, enabled by setting METRICS_PORT
+async def start_metrics_server():
+    port = os.getenv('METRICS_PORT')
+    if not port:
+        return
+    server = MetricsServer(bot, os.getenv('METRICS_HOST', '127.0.0.1'), int(port))
+    server.add_cache('afk_users', lambda: len(bot.afk_index))
+    server.add_cache('special_roles', lambda: len(bot.roles))
+    server.add_cache('warning_count', lambda: len(warnings.ledger) if (warnings := bot.get_cog('Warnings')) else 0)
+    server.add_cache('spam_detection', lambda: len(automod.spam_detection) if (automod := bot.get_cog('AutoModeration')) else 0)
+    server.app.router.add_get('/healthz', bot.health.handle_healthz)
+    server.app.router.add_get('/readyz', bot.health.handle_readyz)
+    try:
+        await server.start()
+        bot.metrics_server = server
+    except OSError as e:
+        logger.error(f"Failed to start metrics server on port {port}: {e}")
 
 # Setup hook
 async def setup_hook():
+    bot.loop_lag.start()
+    bot.health.start()
+    await start_metrics_server()
     await load_cogs()
+    # Time every cog listener and command so stalls can be traced to a cog
+    for cog in bot.cogs.values():
+        instrument_cog(bot, cog, bot.handler_metrics)
 bot.setup_hook = setup_hook
 
 # on_ready event
@@ -103,15 +150,22 @@ async def on_command_error(ctx, error):
         await ctx.send("❌ An unexpected error occurred.")
 
 # Mention response
+async def mention_reply(ctx):
+    if ctx.mentions_bot:
+        await ctx.message.channel.send(
+            f"Hi {ctx.author.mention}, my name is Marin 💖\nI was made by vizen https://tenor.com/view/marin-kitagawa-kitagawa-marin-marin-kitagawa-bisque-gif-24604709"
+        )
+
+async def command_stage(ctx):
+    await bot.process_commands(ctx.message)
+
+bot.message_pipeline.register('mention_reply', mention_reply, STAGE_MENTION_REPLY)
+bot.message_pipeline.register('commands', command_stage, STAGE_COMMANDS)
+
+# Every message goes through the pipeline: automod, AFK, mention reply, then commands
 @bot.event
 async def on_message(message: discord.Message):
-    if message.author.bot:
-        return
-    if bot.user in message.mentions:
-        await message.channel.send(
-            f"Hi {message.author.mention}, my name is Marin 💖\nI was made by vizen https://tenor.com/view/marin-kitagawa-kitagawa-marin-marin-kitagawa-bisque-gif-24604709"
-        )
-    await bot.process_commands(message)
+    await bot.message_pipeline.dispatch(message)
 
 # Run bot
 if __name__ == "__main__":
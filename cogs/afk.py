@@ -1,6 +1,9 @@
 import discord
 from discord.ext import commands
 from utils.logger import setup_logger
+from utils.pipeline import STAGE_AFK
+from utils.rate_tracker import CooldownMap
+from config import AFK_NOTICE_CHANNEL_COOLDOWN, AFK_NOTICE_TARGET_COOLDOWN, AFK_NOTICE_MAX_LINES
 import time
 
 logger = setup_logger('AFK')
@@ -10,17 +13,26 @@ class AFK(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        self.channel_cooldown = CooldownMap(AFK_NOTICE_CHANNEL_COOLDOWN)  # channel_id
+        self.target_cooldown = CooldownMap(AFK_NOTICE_TARGET_COOLDOWN)  # (channel_id, user_id)
+
+    async def cog_load(self):
+        pipeline = getattr(self.bot, 'message_pipeline', None)
+        if pipeline:
+            pipeline.register('afk', self.handle_afk, STAGE_AFK)
+
+    async def cog_unload(self):
+        pipeline = getattr(self.bot, 'message_pipeline', None)
+        if pipeline:
+            pipeline.unregister('afk')
+        await self.bot.afk_index.flush()
 
     @commands.command(name='afk')
+    @commands.guild_only()
     async def set_afk(self, ctx, *, reason="AFK"):
         """Set yourself as AFK"""
-        user_id = ctx.author.id
-        
         # Store AFK status
-        self.bot.afk_users[user_id] = {
-            'reason': reason,
-            'time': time.time()
-        }
+        await self.bot.afk_index.set(ctx.guild.id, ctx.author.id, reason)
         
         embed = discord.Embed(
             title="AFK Status Set",
@@ -30,15 +42,18 @@ class AFK(commands.Cog):
         await ctx.send(embed=embed)
         logger.info(f"{ctx.author} set AFK: {reason}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Check for AFK users in messages"""
-        if message.author.bot:
+    async def handle_afk(self, ctx):
+        """Message pipeline stage: check for AFK users in messages"""
+        message = ctx.message
+        if ctx.guild is None:
+            return
+        guild_afk = await self.bot.afk_index.records(ctx.guild.id)
+        if not guild_afk:
             return
 
         # Check if the message author is AFK and should be removed from AFK
-        if message.author.id in self.bot.afk_users:
-            del self.bot.afk_users[message.author.id]
+        if message.author.id in guild_afk:
+            await self.bot.afk_index.remove(ctx.guild.id, message.author.id)
             embed = discord.Embed(
                 title="Welcome Back!",
                 description=f"{message.author.mention} is no longer AFK.",
@@ -47,32 +62,48 @@ class AFK(commands.Cog):
             await message.channel.send(embed=embed, delete_after=5)
             logger.info(f"{message.author} removed from AFK")
 
-        # Check if any mentioned users are AFK
-        for mentioned_user in message.mentions:
-            if mentioned_user.id in self.bot.afk_users:
-                afk_data = self.bot.afk_users[mentioned_user.id]
-                afk_time = time.time() - afk_data['time']
-                
-                # Convert time to readable format
-                if afk_time < 60:
-                    time_str = f"{int(afk_time)} seconds"
-                elif afk_time < 3600:
-                    time_str = f"{int(afk_time / 60)} minutes"
-                else:
-                    time_str = f"{int(afk_time / 3600)} hours"
-                
-                embed = discord.Embed(
-                    title="User is AFK",
-                    description=f"{mentioned_user.mention} is currently AFK: {afk_data['reason']}",
-                    color=discord.Color.orange()
-                )
-                embed.add_field(name="AFK for", value=time_str, inline=True)
-                await message.channel.send(embed=embed, delete_after=10)
+        # One notice for every AFK member mentioned, unless the channel or member was announced recently
+        now = time.monotonic()
+        channel_id = message.channel.id
+        if not ctx.mention_ids or not self.channel_cooldown.ready(channel_id, now):
+            return
+        lines = []
+        for mentioned_user in ctx.mentions:
+            afk_data = guild_afk.get(mentioned_user.id)
+            if afk_data is None or not self.target_cooldown.ready((channel_id, mentioned_user.id), now):
+                continue
+            self.target_cooldown.trigger((channel_id, mentioned_user.id), now)
+            afk_time = time.time() - afk_data.since
+
+            # Convert time to readable format
+            if afk_time < 60:
+                time_str = f"{int(afk_time)} seconds"
+            elif afk_time < 3600:
+                time_str = f"{int(afk_time / 60)} minutes"
+            else:
+                time_str = f"{int(afk_time / 3600)} hours"
+
+            lines.append(f"{mentioned_user.mention} is currently AFK: {afk_data.reason} (for {time_str})")
+
+        if not lines:
+            return
+        self.channel_cooldown.trigger(channel_id, now)
+        description = "\n".join(lines[:AFK_NOTICE_MAX_LINES])
+        if len(lines) > AFK_NOTICE_MAX_LINES:
+            description += f"\n... and {len(lines) - AFK_NOTICE_MAX_LINES} more"
+        embed = discord.Embed(
+            title="User is AFK" if len(lines) == 1 else "Users are AFK",
+            description=description,
+            color=discord.Color.orange()
+        )
+        await message.channel.send(embed=embed, delete_after=10)
 
     @commands.command(name='afklist')
+    @commands.guild_only()
     async def afk_list(self, ctx):
         """List all AFK users in the server"""
-        if not self.bot.afk_users:
+        guild_afk = await self.bot.afk_index.records(ctx.guild.id)
+        if not guild_afk:
             await ctx.send("No users are currently AFK.")
             return
 
@@ -82,10 +113,10 @@ class AFK(commands.Cog):
         )
         
         guild_afk_users = []
-        for user_id, afk_data in self.bot.afk_users.items():
+        for user_id, afk_data in guild_afk.items():
             user = ctx.guild.get_member(user_id)
             if user:
-                afk_time = time.time() - afk_data['time']
+                afk_time = time.time() - afk_data.since
                 if afk_time < 60:
                     time_str = f"{int(afk_time)}s"
                 elif afk_time < 3600:
@@ -93,7 +124,7 @@ class AFK(commands.Cog):
                 else:
                     time_str = f"{int(afk_time / 3600)}h"
                 
-                guild_afk_users.append(f"{user.mention} - {afk_data['reason']} ({time_str})")
+                guild_afk_users.append(f"{user.mention} - {afk_data.reason} ({time_str})")
 
         if guild_afk_users:
             embed.description = "\n".join(guild_afk_users[:10])  # Limit to 10 users
@@ -1,7 +1,21 @@
+import time
+from collections import Counter
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from utils.logger import setup_logger
-from config import BAD_WORDS
+from utils.rate_tracker import RateTracker
+from utils.message_index import RecentMessageIndex
+from utils.message_profile import MessageProfile
+from utils.automod_settings import AutomodSettingsStore
+from utils.flood import DuplicateFloodDetector
+from utils.minhash import NearDuplicateDetector
+from utils.notices import NoticeAggregator
+from utils.pipeline import STAGE_AUTOMOD
+from config import (
+    AUTOMOD_MAX_SPAM_WINDOW, FLOOD_WINDOW, FLOOD_USER_THRESHOLD,
+    FLOOD_CHANNEL_THRESHOLD, FLOOD_MIN_LENGTH, NEAR_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_USER_THRESHOLD, NEAR_DUPLICATE_WINDOW, NEAR_DUPLICATE_MIN_LENGTH
+)
 
 logger = setup_logger('AutoModeration')
 
@@ -10,117 +24,206 @@ class AutoModeration(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.automod_enabled = True
-        self.bad_words = BAD_WORDS
-        self.spam_detection = {}  # Track message frequency per user
-
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Monitor messages for auto-moderation"""
-        if message.author.bot or not self.automod_enabled:
-            return
+        self.settings = AutomodSettingsStore()  # Per-guild settings, cached after first lookup
+        self.spam_detection = RateTracker(window=AUTOMOD_MAX_SPAM_WINDOW)  # Message frequency per (guild, user)
+        self.recent_messages = RecentMessageIndex()  # Recent message IDs per channel for spam cleanup
+        self.flood_detection = DuplicateFloodDetector(
+            window=FLOOD_WINDOW,
+            user_threshold=FLOOD_USER_THRESHOLD,
+            channel_threshold=FLOOD_CHANNEL_THRESHOLD
+        )
+        self.near_duplicates = NearDuplicateDetector(
+            threshold=NEAR_DUPLICATE_THRESHOLD,
+            user_threshold=NEAR_DUPLICATE_USER_THRESHOLD,
+            window=NEAR_DUPLICATE_WINDOW
+        )
+        self.notices = NoticeAggregator("Auto-Moderation")  # One notice per channel per burst
+        self.action_counts = Counter()  # reason -> actions taken, exported as metrics
+        self.evict_trackers.start()
+
+    async def cog_load(self):
+        pipeline = getattr(self.bot, 'message_pipeline', None)
+        if pipeline:
+            pipeline.register('automod', self.moderate, STAGE_AUTOMOD)
+
+    async def cog_unload(self):
+        pipeline = getattr(self.bot, 'message_pipeline', None)
+        if pipeline:
+            pipeline.unregister('automod')
+        self.evict_trackers.cancel()
+        self.notices.close()
+        await self.settings.flush()
+
+    @tasks.loop(seconds=60)
+    async def evict_trackers(self):
+        """Drop spam and flood tracking that has gone quiet"""
+        now = time.time()
+        removed = self.spam_detection.evict_idle(now)
+        if removed:
+            logger.debug(
+                f"Evicted {removed} idle spam trackers "
+                f"({len(self.spam_detection)} active, ~{self.spam_detection.memory_size()} bytes)"
+            )
+        removed = self.flood_detection.evict_idle(now) + self.near_duplicates.evict_idle(now)
+        if removed:
+            logger.debug(
+                f"Evicted {removed} idle flood windows "
+                f"({len(self.flood_detection)} exact, {len(self.near_duplicates)} near-duplicate active)"
+            )
+
+    async def moderate(self, ctx):
+        """Message pipeline stage: returns True if the message was actioned"""
+        message = ctx.message
+        if ctx.guild is None or not self.settings.get(ctx.guild.id).enabled:
+            return False
 
         # Whitelist immunity check
         whitelist_cog = self.bot.get_cog("Whitelist")
         if whitelist_cog and whitelist_cog.is_immune_to_automod(message.author, message.channel):
             logger.info(f"Skipped automod for whitelisted target: {message.author} in {message.channel}")
-            return
+            return False
+
+        self.recent_messages.record(
+            message.channel.id, message.id, message.author.id, message.created_at.timestamp()
+        )
 
-        if await self.check_bad_words(message): return
-        if await self.check_spam(message): return
-        if await self.check_caps(message): return
-        if await self.check_mass_mentions(message): return
+        # Analyze the message once, then run checks cheapest first
+        profile = ctx.profile
+        return (
+            await self.check_mass_mentions(message, profile)
+            or await self.check_caps(message, profile)
+            or await self.check_bad_words(message, profile)
+            or await self.check_spam(message)
+            or await self.check_flood(message, profile)
+            or await self.check_near_duplicates(message, profile)
+        )
 
-    async def check_bad_words(self, message):
+    async def check_bad_words(self, message, profile=None):
         """Check message for inappropriate content"""
-        content_lower = message.content.lower()
-        for bad_word in self.bad_words:
-            if bad_word in content_lower:
-                try:
-                    await message.delete()
-                    embed = discord.Embed(
-                        title="Message Removed",
-                        description=f"{message.author.mention}, your message contained inappropriate content and has been removed.",
-                        color=discord.Color.red()
-                    )
-                    await message.channel.send(embed=embed, delete_after=5)
-                    logger.info(f"Removed inappropriate message from {message.author} in {message.channel}")
-                    return True
-                except discord.Forbidden:
-                    logger.warning("Missing permissions to delete messages")
-                except discord.NotFound:
-                    pass
+        profile = profile or MessageProfile.from_message(message)
+        settings = self.settings.get(message.guild.id)
+        if settings.matcher.search(profile.normalized) is None:
+            return False
+
+        try:
+            await message.delete()
+            self.report_action(message, "inappropriate content")
+            logger.info(f"Removed inappropriate message from {message.author} in {message.channel}")
+            return True
+        except discord.Forbidden:
+            logger.warning("Missing permissions to delete messages")
+        except discord.NotFound:
+            pass
         return False
 
+    async def check_flood(self, message, profile=None):
+        """Check for the same text being posted by many users or across channels"""
+        profile = profile or MessageProfile.from_message(message)
+        if len(profile.normalized) < FLOOD_MIN_LENGTH:
+            return False
+
+        settings = self.settings.get(message.guild.id)
+        matches = self.flood_detection.record(
+            message.guild.id, hash(profile.normalized), message.channel.id,
+            message.author.id, message.id, message.created_at.timestamp(),
+            settings.flood_user_threshold, settings.flood_channel_threshold
+        )
+        if not matches:
+            return False
+
+        await self.remove_messages(message, matches, "duplicate message flood")
+        logger.info(f"Removed {len(matches)} duplicate flood message(s) in {message.guild}")
+        return True
+
+    async def check_near_duplicates(self, message, profile=None):
+        """Check for lightly edited copies of the same text from several users"""
+        profile = profile or MessageProfile.from_message(message)
+        if len(profile.normalized) < NEAR_DUPLICATE_MIN_LENGTH:
+            return False
+
+        matches = self.near_duplicates.record(
+            message.guild.id, profile.normalized, message.channel.id,
+            message.author.id, message.id, message.created_at.timestamp()
+        )
+        if not matches:
+            return False
+
+        await self.remove_messages(message, matches, "copypasta")
+        logger.info(f"Removed {len(matches)} near-duplicate message(s) in {message.guild}")
+        return True
+
+    def report_action(self, message, reason: str):
+        """Count an automod action and queue its channel notice"""
+        self.action_counts[reason] += 1
+        self.notices.notify(message.channel, message.author, reason)
+
+    async def remove_messages(self, message, targets, reason):
+        """Bulk-delete (channel_id, message_id) pairs per channel and queue a notice"""
+        by_channel = {}
+        for channel_id, message_id in targets:
+            by_channel.setdefault(channel_id, []).append(discord.Object(id=message_id))
+
+        for channel_id, objects in by_channel.items():
+            channel = message.channel if channel_id == message.channel.id else message.guild.get_channel(channel_id)
+            if channel is None:
+                continue
+            try:
+                await channel.delete_messages(objects)
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to remove messages in {channel}: {e}")
+
+        self.report_action(message, reason)
+
     async def check_spam(self, message):
         """Check for spam messages"""
-        user_id = message.author.id
+        settings = self.settings.get(message.guild.id)
+        key = (message.guild.id, message.author.id)
         current_time = message.created_at.timestamp()
 
-        if user_id not in self.spam_detection:
-            self.spam_detection[user_id] = []
-
-        self.spam_detection[user_id].append(current_time)
-        self.spam_detection[user_id] = [
-            t for t in self.spam_detection[user_id] if current_time - t < 10
-        ]
+        if self.spam_detection.exceeded(key, current_time, settings.spam_window, settings.spam_limit):
+            # One bulk delete for the whole burst instead of a history fetch plus a DELETE per message
+            message_ids = self.recent_messages.pop_author_messages(
+                message.channel.id, message.author.id, current_time - settings.spam_window
+            )
+            if message_ids:
+                try:
+                    await message.channel.delete_messages([discord.Object(id=mid) for mid in message_ids])
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    logger.warning(f"Bulk delete failed in {message.channel}: {e}")
 
-        if len(self.spam_detection[user_id]) > 5:
-            try:
-                async for msg in message.channel.history(limit=10):
-                    if msg.author == message.author and (current_time - msg.created_at.timestamp()) < 10:
-                        try:
-                            await msg.delete()
-                        except (discord.NotFound, discord.Forbidden):
-                            pass
-
-                embed = discord.Embed(
-                    title="Spam Detected",
-                    description=f"{message.author.mention}, please slow down your messages.",
-                    color=discord.Color.orange()
-                )
-                await message.channel.send(embed=embed, delete_after=5)
-                self.spam_detection[user_id] = []
-                logger.info(f"Spam detected from {message.author} in {message.channel}")
-                return True
-            except discord.Forbidden:
-                logger.warning("Missing permissions to manage spam")
+            self.report_action(message, "spam")
+            self.spam_detection.reset(key)
+            logger.info(f"Spam detected from {message.author} in {message.channel}")
+            return True
         return False
 
-    async def check_caps(self, message):
+    async def check_caps(self, message, profile=None):
         """Check for excessive caps"""
-        if len(message.content) < 10:
+        profile = profile or MessageProfile.from_message(message)
+        if profile.length < 10:
             return False
 
-        caps_count = sum(1 for c in message.content if c.isupper())
-        caps_percentage = caps_count / len(message.content)
-
-        if caps_percentage > 0.7:
+        if profile.caps_ratio > self.settings.get(message.guild.id).caps_threshold:
             try:
                 await message.delete()
-                embed = discord.Embed(
-                    title="Excessive Caps",
-                    description=f"{message.author.mention}, please don't use excessive capital letters.",
-                    color=discord.Color.orange()
-                )
-                await message.channel.send(embed=embed, delete_after=5)
+                self.report_action(message, "excessive caps")
                 logger.info(f"Removed caps message from {message.author} in {message.channel}")
                 return True
             except (discord.NotFound, discord.Forbidden):
                 pass
         return False
 
-    async def check_mass_mentions(self, message):
+    async def check_mass_mentions(self, message, profile=None):
         """Check for mass mentions"""
-        if len(message.mentions) > 5:
+        profile = profile or MessageProfile.from_message(message)
+        if profile.mention_count > self.settings.get(message.guild.id).mention_limit:
             try:
                 await message.delete()
-                embed = discord.Embed(
-                    title="Mass Mention Detected",
-                    description=f"{message.author.mention}, please don't mention too many users at once.",
-                    color=discord.Color.red()
-                )
-                await message.channel.send(embed=embed, delete_after=5)
+                self.report_action(message, "mass mentions")
                 logger.info(f"Removed mass mention from {message.author} in {message.channel}")
                 return True
             except (discord.NotFound, discord.Forbidden):
@@ -131,29 +234,95 @@ class AutoModeration(commands.Cog):
     @commands.has_permissions(manage_messages=True)
     async def toggle_automod(self, ctx, status: str = None):
         """Toggle auto-moderation on/off"""
+        settings = self.settings.get(ctx.guild.id)
         if status is None:
-            status_text = "enabled" if self.automod_enabled else "disabled"
-            await ctx.send(f"Auto-moderation is currently **{status_text}**.")
+            status_text = "enabled" if settings.enabled else "disabled"
+            embed = discord.Embed(
+                title="Auto-Moderation Settings",
+                description=f"Auto-moderation is currently **{status_text}**.",
+                color=discord.Color.blue()
+            )
+            embed.add_field(name="Caps Threshold", value=f"{settings.caps_threshold:.0%}", inline=True)
+            embed.add_field(name="Spam Window", value=f"{settings.spam_window}s", inline=True)
+            embed.add_field(name="Spam Limit", value=str(settings.spam_limit), inline=True)
+            embed.add_field(name="Mention Limit", value=str(settings.mention_limit), inline=True)
+            embed.add_field(
+                name="Flood Thresholds",
+                value=f"{settings.flood_user_threshold} users / {settings.flood_channel_threshold} channels",
+                inline=True
+            )
+            embed.add_field(name="Bad Words", value=str(len(settings.bad_words)), inline=True)
+            await ctx.send(embed=embed)
             return
 
         if status.lower() in ['on', 'enable', 'true']:
-            self.automod_enabled = True
+            settings.enabled = True
+            self.settings.commit(ctx.guild.id)
             await ctx.send("✅ Auto-moderation **enabled**.")
         elif status.lower() in ['off', 'disable', 'false']:
-            self.automod_enabled = False
+            settings.enabled = False
+            self.settings.commit(ctx.guild.id)
             await ctx.send("❌ Auto-moderation **disabled**.")
         else:
             await ctx.send("❌ Invalid status. Use `on` or `off`.")
 
+    @commands.command(name='automodset')
+    @commands.has_permissions(manage_messages=True)
+    async def set_automod_option(self, ctx, option: str, value: float):
+        """Set an auto-moderation option (caps, spamwindow, spamlimit, mentions, floodusers, floodchannels)"""
+        settings = self.settings.get(ctx.guild.id)
+        option = option.lower()
+
+        if option == 'caps':
+            # Accept either a fraction (0.7) or a percentage (70)
+            threshold = value / 100 if value > 1 else value
+            if not 0 < threshold <= 1:
+                await ctx.send("❌ Caps threshold must be between 1 and 100 percent.")
+                return
+            settings.caps_threshold = threshold
+        elif option == 'spamwindow':
+            if not 1 <= value <= AUTOMOD_MAX_SPAM_WINDOW:
+                await ctx.send(f"❌ Spam window must be between 1 and {AUTOMOD_MAX_SPAM_WINDOW} seconds.")
+                return
+            settings.spam_window = value
+        elif option == 'spamlimit':
+            if value < 1:
+                await ctx.send("❌ Spam limit must be at least 1.")
+                return
+            settings.spam_limit = int(value)
+        elif option == 'mentions':
+            if value < 1:
+                await ctx.send("❌ Mention limit must be at least 1.")
+                return
+            settings.mention_limit = int(value)
+        elif option == 'floodusers':
+            if value < 2:
+                await ctx.send("❌ Flood user threshold must be at least 2.")
+                return
+            settings.flood_user_threshold = int(value)
+        elif option == 'floodchannels':
+            if value < 2:
+                await ctx.send("❌ Flood channel threshold must be at least 2.")
+                return
+            settings.flood_channel_threshold = int(value)
+        else:
+            await ctx.send("❌ Invalid option. Use `caps`, `spamwindow`, `spamlimit`, `mentions`, `floodusers` or `floodchannels`.")
+            return
+
+        self.settings.commit(ctx.guild.id)
+        await ctx.send(f"✅ Set `{option}` to `{value:g}`.")
+        logger.info(f"Automod option {option} set to {value} in {ctx.guild}")
+
     @commands.command(name='addbadword')
     @commands.has_permissions(manage_messages=True)
     async def add_bad_word(self, ctx, *, word):
         """Add a word to the bad words filter"""
-        word_lower = word.lower()
-        if word_lower not in self.bad_words:
-            self.bad_words.append(word_lower)
+        settings = self.settings.get(ctx.guild.id)
+        if not settings.has_bad_word(word):
+            settings.add_bad_word(word)
+            self.settings.commit(ctx.guild.id)
             await ctx.send(f"✅ Added `{word}` to the bad words filter.")
-            logger.info(f"Added bad word: {word}")
+            logger.info(f"Added bad word in {ctx.guild}: {word}")
         else:
             await ctx.send(f"❌ `{word}` is already in the filter.")
 
@@ -161,11 +330,12 @@ class AutoModeration(commands.Cog):
     @commands.has_permissions(manage_messages=True)
     async def remove_bad_word(self, ctx, *, word):
         """Remove a word from the bad words filter"""
-        word_lower = word.lower()
-        if word_lower in self.bad_words:
-            self.bad_words.remove(word_lower)
+        settings = self.settings.get(ctx.guild.id)
+        if settings.has_bad_word(word):
+            settings.remove_bad_word(word)
+            self.settings.commit(ctx.guild.id)
             await ctx.send(f"✅ Removed `{word}` from the bad words filter.")
-            logger.info(f"Removed bad word: {word}")
+            logger.info(f"Removed bad word in {ctx.guild}: {word}")
         else:
             await ctx.send(f"❌ `{word}` is not in the filter.")
 
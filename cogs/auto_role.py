@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 from utils.logger import setup_logger
+from utils.role_registry import ROLE_AUTO
 
 logger = setup_logger('AutoRole')
 
@@ -9,25 +10,23 @@ class AutoRole(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.auto_roles = {}  # Guild ID -> Role ID mapping
+
+    async def cog_unload(self):
+        await self.bot.roles.flush()
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Assign roles when a member joins"""
-        guild_id = member.guild.id
+        role = self.bot.roles.get(member.guild, ROLE_AUTO)
         
-        if guild_id in self.auto_roles:
-            role_id = self.auto_roles[guild_id]
-            role = member.guild.get_role(role_id)
-            
-            if role:
-                try:
-                    await member.add_roles(role, reason="Auto role assignment")
-                    logger.info(f"Assigned role {role.name} to {member} in {member.guild}")
-                except discord.Forbidden:
-                    logger.warning(f"Missing permissions to assign role {role.name} in {member.guild}")
-                except discord.HTTPException as e:
-                    logger.error(f"Failed to assign role to {member}: {e}")
+        if role:
+            try:
+                await member.add_roles(role, reason="Auto role assignment")
+                logger.info(f"Assigned role {role.name} to {member} in {member.guild}")
+            except discord.Forbidden:
+                logger.warning(f"Missing permissions to assign role {role.name} in {member.guild}")
+            except discord.HTTPException as e:
+                logger.error(f"Failed to assign role to {member}: {e}")
 
     @commands.command(name='setautorole')
     @commands.has_permissions(manage_roles=True)
@@ -39,7 +38,7 @@ class AutoRole(commands.Cog):
             await ctx.send("❌ I cannot assign this role as it's higher than or equal to my highest role.")
             return
 
-        self.auto_roles[ctx.guild.id] = role.id
+        self.bot.roles.set(ctx.guild.id, ROLE_AUTO, role.id)
         
         embed = discord.Embed(
             title="Auto Role Set",
@@ -53,8 +52,7 @@ class AutoRole(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def remove_auto_role(self, ctx):
         """Remove the auto-assign role"""
-        if ctx.guild.id in self.auto_roles:
-            del self.auto_roles[ctx.guild.id]
+        if self.bot.roles.remove(ctx.guild.id, ROLE_AUTO) is not None:
             await ctx.send("✅ Auto role assignment has been disabled.")
             logger.info(f"Auto role removed in {ctx.guild}")
         else:
@@ -63,8 +61,8 @@ class AutoRole(commands.Cog):
     @commands.command(name='autoroleinfo')
     async def auto_role_info(self, ctx):
         """Show current auto role settings"""
-        if ctx.guild.id in self.auto_roles:
-            role_id = self.auto_roles[ctx.guild.id]
+        role_id = self.bot.roles.get_id(ctx.guild.id, ROLE_AUTO)
+        if role_id is not None:
             role = ctx.guild.get_role(role_id)
             
             if role:
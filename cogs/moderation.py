@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 from utils.logger import setup_logger
+from utils.overwrites import MUTE_OVERWRITES
+from utils.role_registry import ROLE_MUTE
 
 logger = setup_logger('Moderation')
 
@@ -37,17 +39,18 @@ class Moderation(commands.Cog):
     @commands.bot_has_permissions(manage_roles=True)
     async def mute_user(self, ctx, member: discord.Member, *, reason="No reason provided"):
         """Mutes a user in the server"""
-        mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
-        
         # Create mute role if it doesn't exist
-        if not mute_role:
-            try:
-                mute_role = await ctx.guild.create_role(name="Muted")
-                for channel in ctx.guild.channels:
-                    await channel.set_permissions(mute_role, send_messages=False, speak=False)
-            except discord.Forbidden:
-                await ctx.send("❌ I don't have permission to create the Muted role.")
-                return
+        try:
+            mute_role = await self.bot.roles.ensure(ctx.guild, ROLE_MUTE)
+        except discord.Forbidden:
+            await ctx.send("❌ I don't have permission to create the Muted role.")
+            return
+
+        job = self.bot.overwrites.apply(mute_role, MUTE_OVERWRITES, reason="Mute role setup")
+        if job.total:
+            status = await ctx.send(f"⏳ Setting up the Muted role in {job.total} channel(s)...")
+            await job.wait()
+            await status.edit(content=f"🔧 Muted role set up: {job.format_progress()}.")
 
         try:
             await member.add_roles(mute_role, reason=reason)
@@ -71,7 +74,7 @@ class Moderation(commands.Cog):
     @commands.bot_has_permissions(manage_roles=True)
     async def unmute_user(self, ctx, member: discord.Member):
         """Unmutes a user in the server"""
-        mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
+        mute_role = self.bot.roles.get(ctx.guild, ROLE_MUTE)
         
         if not mute_role:
             await ctx.send("❌ Muted role not found.")
@@ -319,6 +319,36 @@ class Owner(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             self.logger.error(f"Failed to send followup in server_logs_error: {e}")
 
+    @app_commands.command(name="slow_handlers", description="(bot owner only)")
+    @app_commands.describe(limit="How many handlers to show")
+    @is_bot_owner()
+    async def slow_handlers(self, interaction: discord.Interaction, limit: app_commands.Range[int, 1, 25] = 10):
+        """Show the event handlers and commands with the worst latency"""
+        embed = discord.Embed(title="Slowest Handlers", color=discord.Color.blue())
+
+        loop_lag = getattr(self.bot, 'loop_lag', None)
+        if loop_lag:
+            lag = loop_lag.histogram
+            embed.add_field(
+                name="Event Loop Lag",
+                value=f"now {loop_lag.lag * 1000:.1f}ms · p99 {lag.percentile(99) * 1000:.1f}ms · max {lag.max * 1000:.1f}ms",
+                inline=False
+            )
+
+        metrics = getattr(self.bot, 'handler_metrics', None)
+        rows = metrics.slowest(limit) if metrics else []
+        if rows:
+            embed.description = "\n".join(
+                f"`{cog}.{handler}` — {histogram.count} calls · mean {histogram.mean * 1000:.1f}ms · "
+                f"p99 ≤{histogram.percentile(99) * 1000:.1f}ms · max {histogram.max * 1000:.1f}ms"
+                for cog, handler, histogram in rows
+            )
+        else:
+            embed.description = "No handler timings recorded yet."
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.logger.info(f'Slow_handlers executed by {interaction.user.id}')
+
     @commands.Cog.listener()
     async def on_guild_join(self, guild):
         if not self.log_channel_id:
@@ -1,61 +1,55 @@
 import discord
 from discord.ext import commands
 from utils.logger import setup_logger
+from utils.role_registry import ROLE_QUARANTINE
 
 logger = setup_logger('Quarantine')
 
+QUARANTINE_TEXT_OVERWRITES = {
+    'send_messages': False,
+    'add_reactions': False,
+    'create_public_threads': False,
+    'create_private_threads': False,
+    'send_messages_in_threads': False,
+}
+QUARANTINE_VOICE_OVERWRITES = {
+    'connect': False,
+    'speak': False,
+    'stream': False,
+    'use_voice_activation': False,
+}
+
+
+def quarantine_overwrites(channel):
+    """Overwrites the Quarantined role needs in a channel, or None to leave it alone"""
+    if isinstance(channel, discord.TextChannel):
+        return QUARANTINE_TEXT_OVERWRITES
+    if isinstance(channel, discord.VoiceChannel):
+        return QUARANTINE_VOICE_OVERWRITES
+    return None
+
 class Quarantine(commands.Cog):
     """Quarantine system to restrict user access"""
     
     def __init__(self, bot):
         self.bot = bot
 
-    async def setup_quarantine_role(self, guild):
-        """Create and configure the quarantine role"""
-        quarantine_role = discord.utils.get(guild.roles, name="Quarantined")
-        
-        if not quarantine_role:
-            try:
-                # Create the quarantine role
-                quarantine_role = await guild.create_role(
-                    name="Quarantined",
-                    color=discord.Color.dark_red(),
-                    reason="Quarantine role setup"
-                )
-                
-                # Set permissions for all channels
-                for channel in guild.channels:
-                    try:
-                        if isinstance(channel, discord.TextChannel):
-                            # Deny all text permissions
-                            await channel.set_permissions(
-                                quarantine_role,
-                                send_messages=False,
-                                add_reactions=False,
-                                create_public_threads=False,
-                                create_private_threads=False,
-                                send_messages_in_threads=False,
-                                reason="Quarantine setup"
-                            )
-                        elif isinstance(channel, discord.VoiceChannel):
-                            # Deny voice permissions
-                            await channel.set_permissions(
-                                quarantine_role,
-                                connect=False,
-                                speak=False,
-                                stream=False,
-                                use_voice_activation=False,
-                                reason="Quarantine setup"
-                            )
-                    except discord.Forbidden:
-                        logger.warning(f"Cannot set permissions for {channel.name}")
-                
-                logger.info(f"Quarantine role created and configured in {guild.name}")
-                
-            except discord.Forbidden:
-                logger.error(f"Missing permissions to create quarantine role in {guild.name}")
-                return None
-        
+    async def setup_quarantine_role(self, guild, progress=None):
+        """Create the quarantine role if needed and make sure every channel restricts it"""
+        try:
+            quarantine_role = await self.bot.roles.ensure(
+                guild,
+                ROLE_QUARANTINE,
+                color=discord.Color.dark_red(),
+                reason="Quarantine role setup"
+            )
+        except discord.Forbidden:
+            logger.error(f"Missing permissions to create quarantine role in {guild.name}")
+            return None
+
+        await self.bot.overwrites.apply(
+            quarantine_role, quarantine_overwrites, reason="Quarantine setup", progress=progress
+        ).wait()
         return quarantine_role
 
     @commands.command(name='quarantine')
@@ -76,8 +70,18 @@ class Quarantine(commands.Cog):
             await ctx.send("❌ You cannot quarantine someone with equal or higher roles.")
             return
 
-        # Setup quarantine role
-        quarantine_role = await self.setup_quarantine_role(ctx.guild)
+        # Setup quarantine role, reporting progress if channels need updating
+        status = None
+
+        async def report(job):
+            nonlocal status
+            text = f"⏳ Setting up the Quarantined role: {job.format_progress()}"
+            if status is None:
+                status = await ctx.send(text)
+            else:
+                await status.edit(content=text)
+
+        quarantine_role = await self.setup_quarantine_role(ctx.guild, progress=report)
         if not quarantine_role:
             await ctx.send("❌ Failed to setup quarantine role. Check my permissions.")
             return
@@ -132,7 +136,7 @@ class Quarantine(commands.Cog):
     @commands.bot_has_permissions(manage_roles=True)
     async def unquarantine_user(self, ctx, member: discord.Member):
         """Remove quarantine from a user"""
-        quarantine_role = discord.utils.get(ctx.guild.roles, name="Quarantined")
+        quarantine_role = self.bot.roles.get(ctx.guild, ROLE_QUARANTINE)
         
         if not quarantine_role:
             await ctx.send("❌ Quarantine role not found.")
@@ -178,7 +182,7 @@ class Quarantine(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     async def list_quarantined(self, ctx):
         """List all quarantined users"""
-        quarantine_role = discord.utils.get(ctx.guild.roles, name="Quarantined")
+        quarantine_role = self.bot.roles.get(ctx.guild, ROLE_QUARANTINE)
         
         if not quarantine_role:
             await ctx.send("❌ Quarantine role not found.")
@@ -213,32 +217,12 @@ class Quarantine(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
         """Automatically set quarantine permissions for new channels"""
-        quarantine_role = discord.utils.get(channel.guild.roles, name="Quarantined")
+        quarantine_role = self.bot.roles.get(channel.guild, ROLE_QUARANTINE)
         
         if quarantine_role:
-            try:
-                if isinstance(channel, discord.TextChannel):
-                    await channel.set_permissions(
-                        quarantine_role,
-                        send_messages=False,
-                        add_reactions=False,
-                        create_public_threads=False,
-                        create_private_threads=False,
-                        send_messages_in_threads=False,
-                        reason="Auto-setup quarantine permissions"
-                    )
-                elif isinstance(channel, discord.VoiceChannel):
-                    await channel.set_permissions(
-                        quarantine_role,
-                        connect=False,
-                        speak=False,
-                        stream=False,
-                        use_voice_activation=False,
-                        reason="Auto-setup quarantine permissions"
-                    )
-                logger.info(f"Set quarantine permissions for new channel: {channel.name}")
-            except discord.Forbidden:
-                logger.warning(f"Cannot set quarantine permissions for new channel: {channel.name}")
+            await self.bot.overwrites.apply(
+                quarantine_role, quarantine_overwrites, channels=[channel], reason="Auto-setup quarantine permissions"
+            ).wait()
 
 async def setup(bot):
     await bot.add_cog(Quarantine(bot))
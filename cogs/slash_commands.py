@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.logger import setup_logger
+from utils.role_registry import ROLE_AUTO, ROLE_QUARANTINE
 
 logger = setup_logger('SlashCommands')
 
@@ -490,7 +491,7 @@ class SlashCommands(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        quarantine_role = discord.utils.get(interaction.guild.roles, name="Quarantined")
+        quarantine_role = self.bot.roles.get(interaction.guild, ROLE_QUARANTINE)
         if not quarantine_role or quarantine_role not in member.roles:
             embed = discord.Embed(title="❌ Error", description="This user is not quarantined.", color=discord.Color.red())
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -521,19 +522,11 @@ class SlashCommands(commands.Cog):
 
     @app_commands.command(name="afk", description="Set yourself as AFK")
     @app_commands.describe(reason="Reason for being AFK")
+    @app_commands.guild_only()
     async def afk_slash(self, interaction: discord.Interaction, reason: str = "AFK"):
         """Set AFK status using slash commands"""
-        user_id = interaction.user.id
-        
-        if not hasattr(self.bot, 'afk_users'):
-            self.bot.afk_users = {}
-        
         # Store AFK status
-        import time
-        self.bot.afk_users[user_id] = {
-            'reason': reason,
-            'time': time.time()
-        }
+        await self.bot.afk_index.set(interaction.guild.id, interaction.user.id, reason)
         
         embed = discord.Embed(
             title="😴 AFK Status Set",
@@ -556,12 +549,11 @@ class SlashCommands(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        if not hasattr(self.bot, 'afk_users') or member.id not in self.bot.afk_users:
+        if await self.bot.afk_index.remove(interaction.guild.id, member.id) is None:
             embed = discord.Embed(title="❌ Error", description="This user is not AFK.", color=discord.Color.red())
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        del self.bot.afk_users[member.id]
         embed = discord.Embed(
             title="✅ AFK Removed",
             description=f"{member.mention} is no longer AFK.",
@@ -780,21 +772,8 @@ class SlashCommands(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        if not hasattr(self.bot, 'warnings'):
-            self.bot.warnings = {}
-
-        # Add warning
-        if member.id not in self.bot.warnings:
-            self.bot.warnings[member.id] = []
-        
-        warning_data = {
-            'reason': reason,
-            'moderator': str(interaction.user),
-            'timestamp': discord.utils.utcnow().isoformat()
-        }
-        self.bot.warnings[member.id].append(warning_data)
-        
-        warning_count = len(self.bot.warnings[member.id])
+        # Add warning to the shared ledger so prefix and slash warnings count together
+        warning_count = await warnings_cog.ledger.warn(interaction.guild.id, member.id, interaction.user.id, reason)
         
         embed = discord.Embed(
             title="⚠️ User Warned",
@@ -808,6 +787,8 @@ class SlashCommands(commands.Cog):
         await interaction.response.send_message(embed=embed)
         logger.info(f"{member} warned by {interaction.user}: {reason} (Total: {warning_count})")
 
+        warnings_cog.escalate(interaction.channel, member, warning_count)
+
     # === AUTO ROLE SLASH COMMANDS ===
 
     @app_commands.command(name="autorole", description="Manage auto-role assignment for new members")
@@ -840,7 +821,7 @@ class SlashCommands(commands.Cog):
                 await interaction.response.send_message(embed=embed, ephemeral=True)
                 return
 
-            autorole_cog.auto_roles[interaction.guild.id] = role.id
+            self.bot.roles.set(interaction.guild.id, ROLE_AUTO, role.id)
             embed = discord.Embed(
                 title="✅ Auto Role Set",
                 description=f"New members will automatically receive the {role.mention} role.",
@@ -850,8 +831,7 @@ class SlashCommands(commands.Cog):
             logger.info(f"Auto role set to {role.name} in {interaction.guild}")
 
         elif action == "remove":
-            if interaction.guild.id in autorole_cog.auto_roles:
-                del autorole_cog.auto_roles[interaction.guild.id]
+            if self.bot.roles.remove(interaction.guild.id, ROLE_AUTO) is not None:
                 embed = discord.Embed(title="✅ Auto Role Removed", description="Auto role assignment has been disabled.", color=discord.Color.green())
                 await interaction.response.send_message(embed=embed)
                 logger.info(f"Auto role removed in {interaction.guild}")
@@ -860,8 +840,8 @@ class SlashCommands(commands.Cog):
                 await interaction.response.send_message(embed=embed, ephemeral=True)
 
         elif action == "info":
-            if interaction.guild.id in autorole_cog.auto_roles:
-                role_id = autorole_cog.auto_roles[interaction.guild.id]
+            role_id = self.bot.roles.get_id(interaction.guild.id, ROLE_AUTO)
+            if role_id is not None:
                 role = interaction.guild.get_role(role_id)
                 
                 if role:
@@ -1,17 +1,58 @@
+import asyncio
 import discord
+from datetime import timedelta
 from discord.ext import commands
 from utils.logger import setup_logger
-from config import MAX_WARNINGS, WARNING_ACTIONS
+from utils.warning_ledger import WarningLedger
+from utils.warning_settings import WarningSettingsStore, DEFAULT_POLICY
+from utils.scheduler import DeadlineScheduler
+from utils.escalation import EscalationAction, MAX_THRESHOLD, format_duration
+from utils.helpers import Paginator, PaginatorView
+from utils.overwrites import MUTE_OVERWRITES
+from utils.role_registry import ROLE_MUTE
 
 logger = setup_logger('Warnings')
 
+WARNLIST_PAGE_SIZE = 15
+
 class Warnings(commands.Cog):
     """Warning system for user management"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.settings = WarningSettingsStore()  # Per-guild expiry
+        self.ledger = WarningLedger(bot.db, on_warn=self.schedule_expiry)  # Durable history; counts are served from memory
+        self.expiry = DeadlineScheduler(self.expire_warnings)  # Wakes only when the next warning is due
+        self._escalations = set()  # Keeps running escalation tasks referenced
+
+    async def cog_load(self):
+        await self.ledger.load()
+        self.expiry.schedule_many(
+            ((guild_id, user_id, warning_id), created_at + expiry)
+            for guild_id, user_id, warning_id, created_at in self.ledger.active_warnings()
+            if (expiry := self.settings.get(guild_id).expiry_seconds)
+        )
+        self.expiry.start()
+
+    async def cog_unload(self):
+        self.expiry.stop()
+        await self.settings.flush()
+
+    def schedule_expiry(self, guild_id, user_id, warning_id, created_at):
+        """Schedule a warning to expire under its guild's expiry setting"""
+        expiry = self.settings.get(guild_id).expiry_seconds
+        if expiry:
+            self.expiry.schedule((guild_id, user_id, warning_id), created_at + expiry)
+        else:
+            self.expiry.cancel((guild_id, user_id, warning_id))
+
+    async def expire_warnings(self, keys):
+        expired = await self.ledger.expire(keys)
+        if expired:
+            logger.info(f"Expired {expired} warning(s)")
 
     @commands.command(name='warn')
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def warn_user(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
         """Issue a warning to a user"""
@@ -23,15 +64,8 @@ class Warnings(commands.Cog):
             await ctx.send("❌ You cannot warn bots.")
             return
 
-        user_id = member.id
-        
-        # Initialize warning count if needed
-        if user_id not in self.bot.warning_count:
-            self.bot.warning_count[user_id] = 0
-        
-        # Increment warning count
-        self.bot.warning_count[user_id] += 1
-        warning_count = self.bot.warning_count[user_id]
+        # Record the warning
+        warning_count = await self.ledger.warn(ctx.guild.id, member.id, ctx.author.id, reason)
 
         try:
             # Send warning to user via DM
@@ -62,72 +96,88 @@ class Warnings(commands.Cog):
         await ctx.send(embed=embed)
         logger.info(f"{member} warned by {ctx.author} for: {reason} (Total: {warning_count})")
 
-        # Check for escalation
-        await self.check_warning_escalation(ctx, member, warning_count)
+        # Escalate without holding up the command
+        self.escalate(ctx.channel, member, warning_count)
 
-    async def check_warning_escalation(self, ctx, member, warning_count):
-        """Check if warning count requires escalation"""
-        if warning_count >= MAX_WARNINGS:
-            # Auto-ban for max warnings
-            try:
-                await member.ban(reason=f"Reached maximum warnings ({MAX_WARNINGS})")
-                
-                embed = discord.Embed(
-                    title="Auto-Ban",
-                    description=f"{member.mention} has been automatically banned for reaching {MAX_WARNINGS} warnings.",
-                    color=discord.Color.red()
-                )
-                await ctx.send(embed=embed)
-                logger.info(f"{member} auto-banned for reaching max warnings")
-                
-            except discord.Forbidden:
-                await ctx.send(f"❌ Cannot ban {member.mention} - missing permissions.")
-        
-        elif warning_count == 2:
-            # Auto-mute for 2 warnings
-            mute_role = discord.utils.get(ctx.guild.roles, name="Muted")
-            
-            if not mute_role:
-                try:
-                    mute_role = await ctx.guild.create_role(name="Muted")
-                    for channel in ctx.guild.channels:
-                        await channel.set_permissions(mute_role, send_messages=False, speak=False)
-                except discord.Forbidden:
-                    await ctx.send("❌ Cannot create Muted role - missing permissions.")
-                    return
+    def escalate(self, channel, member, warning_count):
+        """Apply the guild's escalation policy in the background (channel may be any messageable)"""
+        action = self.settings.get(member.guild.id).policy.action_for(warning_count)
+        if action is None or action.kind == 'warn':
+            return None
+        task = asyncio.create_task(self._escalate(channel, member, warning_count, action))
+        self._escalations.add(task)
+        task.add_done_callback(self._escalations.discard)
+        return task
 
-            try:
-                await member.add_roles(mute_role, reason="Auto-mute for 2 warnings")
-                
-                embed = discord.Embed(
-                    title="Auto-Mute",
-                    description=f"{member.mention} has been automatically muted for receiving 2 warnings.",
-                    color=discord.Color.red()
-                )
-                await ctx.send(embed=embed)
-                logger.info(f"{member} auto-muted for 2 warnings")
-                
-            except discord.Forbidden:
-                await ctx.send(f"❌ Cannot mute {member.mention} - missing permissions.")
+    async def _escalate(self, channel, member, warning_count, action):
+        handler = getattr(self, f'_escalate_{action.kind}')
+        try:
+            description = await handler(member, warning_count, action)
+        except discord.Forbidden:
+            await channel.send(f"❌ Cannot {action.kind} {member.mention} - missing permissions.")
+            return
+        except Exception as e:
+            logger.error(f"Escalation {action} for {member} failed: {e}")
+            await channel.send(f"❌ Auto-{action.kind} of {member.mention} failed: {e}")
+            return
+
+        embed = discord.Embed(
+            title=f"Auto-{action.kind.capitalize()}",
+            description=f"{member.mention} has been automatically {description} for reaching {warning_count} warnings.",
+            color=discord.Color.red()
+        )
+        await channel.send(embed=embed)
+        logger.info(f"{member} auto-{action} for {warning_count} warnings")
+
+    async def _escalate_mute(self, member, warning_count, action):
+        mute_role = await self.bot.roles.ensure(member.guild, ROLE_MUTE)
+        await self.bot.overwrites.apply(mute_role, MUTE_OVERWRITES, reason="Mute role setup").wait()
+        await member.add_roles(mute_role, reason=f"Auto-mute for {warning_count} warnings")
+        return "muted"
+
+    async def _escalate_timeout(self, member, warning_count, action):
+        await member.timeout(timedelta(seconds=action.duration), reason=f"Auto-timeout for {warning_count} warnings")
+        return f"timed out for {format_duration(action.duration)}"
+
+    async def _escalate_quarantine(self, member, warning_count, action):
+        quarantine_cog = self.bot.get_cog('Quarantine')
+        if quarantine_cog is None:
+            raise RuntimeError("quarantine system is not loaded")
+        quarantine_role = await quarantine_cog.setup_quarantine_role(member.guild)
+        if quarantine_role is None:
+            raise RuntimeError("could not set up the Quarantined role")
+        await member.add_roles(quarantine_role, reason=f"Auto-quarantine for {warning_count} warnings")
+        return "quarantined"
+
+    async def _escalate_kick(self, member, warning_count, action):
+        await member.kick(reason=f"Reached {warning_count} warnings")
+        return "kicked"
+
+    async def _escalate_ban(self, member, warning_count, action):
+        await member.ban(reason=f"Reached {warning_count} warnings")
+        return "banned"
 
     @commands.command(name='warnings', aliases=['warns'])
+    @commands.guild_only()
     async def check_warnings(self, ctx, member: discord.Member = None):
         """Check warning count for a user"""
         if member is None:
             member = ctx.author
 
-        user_id = member.id
-        warning_count = self.bot.warning_count.get(user_id, 0)
+        warning_count = self.ledger.count(ctx.guild.id, member.id)
+        # The guild's policy decides where the limit is, if there is one
+        max_warnings = self.settings.get(ctx.guild.id).policy.max_warnings
+        limit = f"/{max_warnings}" if max_warnings else ""
 
         embed = discord.Embed(
             title="Warning Information",
-            description=f"**User:** {member.mention}\n**Warnings:** {warning_count}/{MAX_WARNINGS}",
+            description=f"**User:** {member.mention}\n**Warnings:** {warning_count}{limit}",
             color=discord.Color.blue()
         )
         
         if warning_count > 0:
             embed.color = discord.Color.yellow()
-            if warning_count >= MAX_WARNINGS - 1:
+            if max_warnings and warning_count >= max_warnings - 1:
                 embed.color = discord.Color.red()
                 embed.add_field(
                     name="⚠️ Warning",
@@ -135,18 +185,98 @@ class Warnings(commands.Cog):
                     inline=False
                 )
 
+            history = await self.ledger.history(ctx.guild.id, member.id)
+            if history:
+                embed.add_field(
+                    name="Recent Warnings",
+                    value="\n".join(
+                        f"<t:{int(created_at)}:R> by <@{moderator_id}>: {reason}"
+                        for moderator_id, reason, created_at in history
+                    )[:1024],
+                    inline=False
+                )
+
+        expiry_days = self.settings.get(ctx.guild.id).expiry_days
+        if expiry_days:
+            embed.set_footer(text=f"Warnings expire after {expiry_days} day(s)")
         await ctx.send(embed=embed)
 
+    @commands.command(name='warnexpiry')
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def set_warning_expiry(self, ctx, days: int = None):
+        """Show or set how many days warnings count (0 = never expire)"""
+        settings = self.settings.get(ctx.guild.id)
+        if days is None:
+            current = f"{settings.expiry_days} day(s)" if settings.expiry_days else "never"
+            await ctx.send(f"⏳ Warnings in this server expire after: **{current}**")
+            return
+        if days < 0:
+            await ctx.send("❌ Days must be 0 or more.")
+            return
+
+        settings.expiry_days = days
+        self.settings.commit(ctx.guild.id)
+        # Reschedule this guild's active warnings under the new setting
+        for guild_id, user_id, warning_id, created_at in list(self.ledger.active_warnings(ctx.guild.id)):
+            self.schedule_expiry(guild_id, user_id, warning_id, created_at)
+
+        await ctx.send(f"✅ Warnings now expire after **{days} day(s)**." if days else "✅ Warnings no longer expire.")
+        logger.info(f"Warning expiry set to {days} day(s) in {ctx.guild} by {ctx.author}")
+
+    @commands.command(name='warnpolicy')
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def warning_policy(self, ctx, count: int = None, action: str = None):
+        """Show or change the escalation policy (e.g. `warnpolicy 3 timeout:1h`, `warnpolicy 3 none`, `warnpolicy 0 reset`)"""
+        settings = self.settings.get(ctx.guild.id)
+        if count is None:
+            lines = [f"**{c}** warning(s) → `{a}`" for c, a in settings.policy.thresholds.items()]
+            embed = discord.Embed(
+                title="Escalation Policy",
+                description="\n".join(lines) or "No automatic actions.",
+                color=discord.Color.blue()
+            )
+            if settings.policy.thresholds:
+                embed.set_footer(text="Counts past the highest threshold repeat its action")
+            await ctx.send(embed=embed)
+            return
+
+        if action is not None and action.lower() == 'reset':
+            settings.policy = DEFAULT_POLICY
+            self.settings.commit(ctx.guild.id)
+            await ctx.send("✅ Escalation policy reset to the default.")
+            logger.info(f"Escalation policy reset in {ctx.guild} by {ctx.author}")
+            return
+        if count < 1 or action is None:
+            await ctx.send("❌ Usage: `warnpolicy <count> <action>`, `warnpolicy <count> none` or `warnpolicy 0 reset`.")
+            return
+        if count > MAX_THRESHOLD:
+            await ctx.send(f"❌ Warning counts above {MAX_THRESHOLD} are not supported.")
+            return
+
+        if action.lower() == 'none':
+            settings.policy = settings.policy.without_threshold(count)
+        else:
+            try:
+                settings.policy = settings.policy.with_threshold(count, EscalationAction.parse(action))
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
+        self.settings.commit(ctx.guild.id)
+
+        result = settings.policy.thresholds.get(count)
+        await ctx.send(f"✅ At **{count}** warning(s): `{result}`." if result else f"✅ Removed the action at **{count}** warning(s).")
+        logger.info(f"Escalation policy in {ctx.guild} set {count} -> {result} by {ctx.author}")
+
     @commands.command(name='clearwarns')
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def clear_warnings(self, ctx, member: discord.Member):
         """Clear all warnings for a user"""
-        user_id = member.id
-        
-        if user_id in self.bot.warning_count:
-            old_count = self.bot.warning_count[user_id]
-            self.bot.warning_count[user_id] = 0
-            
+        old_count = await self.ledger.clear(ctx.guild.id, member.id, ctx.author.id)
+
+        if old_count:
             embed = discord.Embed(
                 title="Warnings Cleared",
                 description=f"Cleared {old_count} warning(s) for {member.mention}.",
@@ -159,6 +289,7 @@ class Warnings(commands.Cog):
             await ctx.send(f"❌ {member.mention} has no warnings to clear.")
 
     @commands.command(name='removewarn')
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def remove_warning(self, ctx, member: discord.Member, amount: int = 1):
         """Remove a specific number of warnings from a user"""
@@ -166,16 +297,13 @@ class Warnings(commands.Cog):
             await ctx.send("❌ Amount must be at least 1.")
             return
 
-        user_id = member.id
-        
-        if user_id not in self.bot.warning_count or self.bot.warning_count[user_id] == 0:
+        old_count = self.ledger.count(ctx.guild.id, member.id)
+        if old_count == 0:
             await ctx.send(f"❌ {member.mention} has no warnings to remove.")
             return
 
-        old_count = self.bot.warning_count[user_id]
-        self.bot.warning_count[user_id] = max(0, old_count - amount)
-        new_count = self.bot.warning_count[user_id]
-        removed = old_count - new_count
+        removed = await self.ledger.remove(ctx.guild.id, member.id, ctx.author.id, amount)
+        new_count = old_count - removed
 
         embed = discord.Embed(
             title="Warnings Removed",
@@ -190,43 +318,28 @@ class Warnings(commands.Cog):
         logger.info(f"Removed {removed} warnings from {member} by {ctx.author}")
 
     @commands.command(name='warnlist')
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def warning_list(self, ctx):
-        """List all users with warnings in the server"""
-        guild_warnings = []
-        
-        for user_id, count in self.bot.warning_count.items():
-            if count > 0:
-                member = ctx.guild.get_member(user_id)
-                if member:
-                    guild_warnings.append((member, count))
-
-        if not guild_warnings:
+        """List all users with warnings in the server, most warned first"""
+        ranking = self.ledger.ranking(ctx.guild.id)
+        if not ranking:
             await ctx.send("✅ No users currently have warnings in this server.")
             return
 
-        # Sort by warning count (descending)
-        guild_warnings.sort(key=lambda x: x[1], reverse=True)
-
-        embed = discord.Embed(
-            title="Server Warning List",
-            color=discord.Color.orange()
-        )
-
-        warning_text = []
-        for member, count in guild_warnings[:15]:  # Limit to 15 users
-            warning_text.append(f"{member.mention} - {count} warning(s)")
-
-        embed.description = "\n".join(warning_text)
-        
-        if len(guild_warnings) > 15:
-            embed.add_field(
-                name="Note",
-                value=f"Showing top 15 users. {len(guild_warnings) - 15} more users have warnings.",
-                inline=False
+        def render(entries, page_number):
+            start = (page_number - 1) * WARNLIST_PAGE_SIZE
+            return discord.Embed(
+                title="Server Warning List",
+                description="\n".join(
+                    f"**{start + i}.** <@{user_id}> - {count} warning(s)"
+                    for i, (user_id, count) in enumerate(entries, 1)
+                ),
+                color=discord.Color.orange()
             )
 
-        await ctx.send(embed=embed)
+        view = PaginatorView(Paginator(ranking, WARNLIST_PAGE_SIZE), render, ctx.author.id)
+        await view.send(ctx)
 
 async def setup(bot):
     await bot.add_cog(Warnings(bot))
@@ -1,37 +1,137 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json, os
 from utils.logger import setup_logger
+from utils.json_store import JsonStore
 
 logger = setup_logger("Whitelist")
 
 WHITELIST_FILE = "data/whitelist.json"
-whitelisted_users = set()
-whitelisted_roles = set()
-whitelisted_channels = set()
+whitelist_store = JsonStore(WHITELIST_FILE)
+
+
+class GuildWhitelist:
+    """Automod-immune users, roles and channels for one guild"""
+
+    __slots__ = ("users", "roles", "channels", "removed_users")
+
+    def __init__(self, users=(), roles=(), channels=(), removed_users=()):
+        self.users = set(users)
+        self.roles = set(roles)
+        self.channels = set(channels)
+        # Legacy global users this guild has un-whitelisted
+        self.removed_users = set(removed_users)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GuildWhitelist":
+        return cls(data.get("users", []), data.get("roles", []), data.get("channels", []), data.get("removed_users", []))
+
+    def to_dict(self) -> dict:
+        data = {"users": list(self.users), "roles": list(self.roles), "channels": list(self.channels)}
+        if self.removed_users:
+            data["removed_users"] = list(self.removed_users)
+        return data
+
+    def __bool__(self):
+        return bool(self.users or self.roles or self.channels or self.removed_users)
+
+
+# Entries from the old single-scope file format. Users apply to every guild
+# unless a guild opts out; roles and channels belong to one guild and are
+# moved into it by migrate_legacy_entries once the guild cache is ready.
+global_whitelist = GuildWhitelist()
+guild_whitelists = {}  # guild_id -> GuildWhitelist
 
 def load_whitelist():
-    if os.path.exists(WHITELIST_FILE):
-        with open(WHITELIST_FILE, "r") as f:
-            data = json.load(f)
-            whitelisted_users.update(data.get("users", []))
-            whitelisted_roles.update(data.get("roles", []))
-            whitelisted_channels.update(data.get("channels", []))
+    data = whitelist_store.load()
+    if data:
+        if "guilds" in data:
+            global_data = data.get("global", {})
+            for guild_id, entries in data["guilds"].items():
+                guild_whitelists[int(guild_id)] = GuildWhitelist.from_dict(entries)
+        else:
+            global_data = data
+        global_whitelist.users.update(global_data.get("users", []))
+        global_whitelist.roles.update(global_data.get("roles", []))
+        global_whitelist.channels.update(global_data.get("channels", []))
+
+def whitelist_snapshot() -> dict:
+    data = {"guilds": {str(gid): wl.to_dict() for gid, wl in guild_whitelists.items() if wl}}
+    if global_whitelist:
+        data["global"] = global_whitelist.to_dict()
+    return data
 
 def save_whitelist():
-    with open(WHITELIST_FILE, "w") as f:
-        json.dump({
-            "users": list(whitelisted_users),
-            "roles": list(whitelisted_roles),
-            "channels": list(whitelisted_channels)
-        }, f)
+    # Coalesced and written off the event loop
+    whitelist_store.save(whitelist_snapshot)
+
+def migrate_legacy_entries(bot) -> int:
+    """Move legacy global roles and channels into their owning guild's whitelist, returning how many moved"""
+    moved = 0
+    for channel_id in list(global_whitelist.channels):
+        channel = bot.get_channel(channel_id)
+        guild = getattr(channel, "guild", None)
+        if guild is not None:
+            get_guild_whitelist(guild.id).channels.add(channel_id)
+            global_whitelist.channels.discard(channel_id)
+            moved += 1
+    for role_id in list(global_whitelist.roles):
+        guild = next((g for g in bot.guilds if g.get_role(role_id) is not None), None)
+        if guild is not None:
+            get_guild_whitelist(guild.id).roles.add(role_id)
+            global_whitelist.roles.discard(role_id)
+            moved += 1
+    if moved:
+        save_whitelist()
+    return moved
+
+def get_guild_whitelist(guild_id: int) -> GuildWhitelist:
+    whitelist = guild_whitelists.get(guild_id)
+    if whitelist is None:
+        whitelist = guild_whitelists[guild_id] = GuildWhitelist()
+    return whitelist
 
 class Whitelist(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # guild_id -> {member_id: immune}; member verdicts are cached until roles or the whitelist change
+        self.immunity_cache = {}
         load_whitelist()
 
+    async def cog_unload(self):
+        await whitelist_store.flush()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if global_whitelist.roles or global_whitelist.channels:
+            moved = migrate_legacy_entries(self.bot)
+            if moved:
+                self.immunity_cache.clear()
+                logger.info(f"Migrated {moved} legacy whitelist role/channel entries to their guilds")
+
+    def toggle(self, entries: set, target_id: int) -> bool:
+        """Toggle target_id in a whitelist set, returning True if it was added"""
+        if target_id in entries:
+            entries.discard(target_id)
+            return False
+        entries.add(target_id)
+        return True
+
+    def toggle_user(self, whitelist: GuildWhitelist, user_id: int) -> bool:
+        """Toggle a user in one guild; legacy global users are opted out per guild, never globally"""
+        if user_id in global_whitelist.users and user_id not in whitelist.users:
+            if user_id in whitelist.removed_users:
+                whitelist.removed_users.discard(user_id)
+                return True
+            whitelist.removed_users.add(user_id)
+            return False
+        return self.toggle(whitelist.users, user_id)
+
+    def legacy_users(self, whitelist) -> set:
+        if whitelist is None:
+            return global_whitelist.users
+        return global_whitelist.users - whitelist.removed_users
+
     @app_commands.command(name="whitelist", description="Toggle automod immunity for a user, role, or channel.")
     @app_commands.describe(user="User to whitelist/unwhitelist", role="Role to whitelist/unwhitelist", channel="Channel to whitelist/unwhitelist")
     async def whitelist(self, interaction: discord.Interaction, user: discord.Member = None, role: discord.Role = None, channel: discord.TextChannel = None):
@@ -44,39 +144,49 @@ class Whitelist(commands.Cog):
             await interaction.response.send_message("⚠️ Please specify a user, role, or channel.", ephemeral=True)
             return
 
+        guild_id = interaction.guild.id
+        whitelist = get_guild_whitelist(guild_id)
+
         if user:
-            if user.id in whitelisted_users:
-                whitelisted_users.remove(user.id)
-                await self.send_embed(interaction, f"{user.mention} removed from automod whitelist.", False)
-            else:
-                whitelisted_users.add(user.id)
-                await self.send_embed(interaction, f"{user.mention} added to automod whitelist.", True)
+            added = self.toggle_user(whitelist, user.id)
+            self.immunity_cache.get(guild_id, {}).pop(user.id, None)
+            action = "added to" if added else "removed from"
+            await self.send_embed(interaction, f"{user.mention} {action} automod whitelist.", added)
 
         elif role:
-            if role.id in whitelisted_roles:
-                whitelisted_roles.remove(role.id)
-                await self.send_embed(interaction, f"Role **{role.name}** removed from automod whitelist.", False)
-            else:
-                whitelisted_roles.add(role.id)
-                await self.send_embed(interaction, f"Role **{role.name}** added to automod whitelist.", True)
+            # Role IDs are unique to this guild, so a legacy entry is simply moved here
+            if role.id in global_whitelist.roles:
+                global_whitelist.roles.discard(role.id)
+                whitelist.roles.add(role.id)
+            added = self.toggle(whitelist.roles, role.id)
+            # Any member may hold the role, so drop every cached verdict it could affect
+            self.immunity_cache.pop(guild_id, None)
+            action = "added to" if added else "removed from"
+            await self.send_embed(interaction, f"Role **{role.name}** {action} automod whitelist.", added)
 
         elif channel:
-            if channel.id in whitelisted_channels:
-                whitelisted_channels.remove(channel.id)
-                await self.send_embed(interaction, f"Channel {channel.mention} removed from automod whitelist.", False)
-            else:
-                whitelisted_channels.add(channel.id)
-                await self.send_embed(interaction, f"Channel {channel.mention} added to automod whitelist.", True)
+            if channel.id in global_whitelist.channels:
+                global_whitelist.channels.discard(channel.id)
+                whitelist.channels.add(channel.id)
+            added = self.toggle(whitelist.channels, channel.id)
+            action = "added to" if added else "removed from"
+            await self.send_embed(interaction, f"Channel {channel.mention} {action} automod whitelist.", added)
 
         save_whitelist()
         logger.info(f"{interaction.user} toggled whitelist for {target} in {interaction.guild.name}")
 
     @app_commands.command(name="whitelist_status", description="View current automod immunity settings.")
     async def whitelist_status(self, interaction: discord.Interaction):
+        guild = interaction.guild
+        whitelist = guild_whitelists.get(guild.id) or GuildWhitelist()
+        users = whitelist.users | self.legacy_users(whitelist)
+        # Unmigrated legacy roles/channels are shown only where they belong
+        roles = whitelist.roles | {rid for rid in global_whitelist.roles if guild.get_role(rid)}
+        channels = whitelist.channels | {cid for cid in global_whitelist.channels if guild.get_channel(cid)}
         embed = discord.Embed(title="🛡️ Automod Whitelist Status", color=discord.Color.blurple())
-        embed.add_field(name="Users", value="\n".join(f"<@{uid}>" for uid in whitelisted_users) or "None", inline=False)
-        embed.add_field(name="Roles", value="\n".join(f"<@&{rid}>" for rid in whitelisted_roles) or "None", inline=False)
-        embed.add_field(name="Channels", value="\n".join(f"<#{cid}>" for cid in whitelisted_channels) or "None", inline=False)
+        embed.add_field(name="Users", value="\n".join(f"<@{uid}>" for uid in users) or "None", inline=False)
+        embed.add_field(name="Roles", value="\n".join(f"<@&{rid}>" for rid in roles) or "None", inline=False)
+        embed.add_field(name="Channels", value="\n".join(f"<#{cid}>" for cid in channels) or "None", inline=False)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     async def send_embed(self, interaction, message: str, added: bool):
@@ -87,12 +197,49 @@ class Whitelist(commands.Cog):
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Forget a member's cached verdict when their roles change"""
+        if before.roles != after.roles:
+            self.immunity_cache.get(after.guild.id, {}).pop(after.id, None)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.immunity_cache.get(member.guild.id, {}).pop(member.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """Deleting a whitelisted role strips it from members without member update events"""
+        whitelist = guild_whitelists.get(role.guild.id)
+        if role.id in global_whitelist.roles or (whitelist and role.id in whitelist.roles):
+            self.immunity_cache.pop(role.guild.id, None)
+
+    def compute_member_immunity(self, member: discord.Member) -> bool:
+        """Resolve a member's immunity from the whitelist (uncached)"""
+        whitelist = guild_whitelists.get(member.guild.id)
+        users = whitelist.users if whitelist else ()
+        roles = whitelist.roles if whitelist else ()
+        if member.id in users:
+            return True
+        if member.id in global_whitelist.users and not (whitelist and member.id in whitelist.removed_users):
+            return True
+        if not roles and not global_whitelist.roles:
+            return False
+        return any(role.id in roles or role.id in global_whitelist.roles for role in member.roles)
+
     def is_immune_to_automod(self, member: discord.Member, channel: discord.TextChannel):
-        return (
-            member.id in whitelisted_users or
-            any(role.id in whitelisted_roles for role in member.roles) or
-            channel.id in whitelisted_channels
-        )
+        guild_id = member.guild.id
+        whitelist = guild_whitelists.get(guild_id)
+        if channel.id in global_whitelist.channels or (whitelist and channel.id in whitelist.channels):
+            return True
+
+        cache = self.immunity_cache.get(guild_id)
+        if cache is None:
+            cache = self.immunity_cache[guild_id] = {}
+        immune = cache.get(member.id)
+        if immune is None:
+            immune = cache[member.id] = self.compute_member_immunity(member)
+        return immune
 
 async def setup(bot):
     await bot.add_cog(Whitelist(bot))
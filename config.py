@@ -32,8 +32,42 @@ BAD_WORDS = [
     'spam', 'inappropriate', 'badword'  # Add actual bad words here
 ]
 
+# Per-guild auto-moderation defaults (guilds can override these with automodset)
+AUTOMOD_CAPS_THRESHOLD = 0.7   # Fraction of uppercase characters
+AUTOMOD_SPAM_WINDOW = 10       # Seconds
+AUTOMOD_SPAM_LIMIT = 5         # Messages allowed per spam window
+AUTOMOD_MENTION_LIMIT = 5      # Mentions allowed per message
+AUTOMOD_MAX_SPAM_WINDOW = 60   # Upper bound guilds may configure
+
+# Duplicate-message flood detection (same text from many users or channels)
+FLOOD_WINDOW = 30              # Seconds
+FLOOD_USER_THRESHOLD = 8       # Distinct users posting the same text (default; automodset floodusers)
+FLOOD_CHANNEL_THRESHOLD = 3    # Distinct channels the same text appears in (default; automodset floodchannels)
+FLOOD_MIN_LENGTH = 15          # Shorter messages ("lol", "gm") are ignored
+
+# Near-duplicate (lightly edited copypasta) detection
+NEAR_DUPLICATE_THRESHOLD = 0.7      # Estimated Jaccard similarity to count as a copy
+NEAR_DUPLICATE_USER_THRESHOLD = 3   # Distinct users posting copies
+NEAR_DUPLICATE_WINDOW = 60          # Seconds
+NEAR_DUPLICATE_MIN_LENGTH = 40      # Only longer messages are indexed
+
+# AFK mention replies
+AFK_NOTICE_CHANNEL_COOLDOWN = 5    # Seconds between AFK notices in one channel
+AFK_NOTICE_TARGET_COOLDOWN = 60    # Seconds before the same AFK member is announced again in a channel
+AFK_NOTICE_MAX_LINES = 10          # AFK members listed in one notice
+
+# Health checks and watchdog
+WATCHDOG_HEARTBEAT_TIMEOUT = 90   # Seconds without a heartbeat ACK before forcing a reconnect
+WATCHDOG_LOOP_LAG_LIMIT = 5.0     # Seconds of event loop lag treated as a stall
+WATCHDOG_STALL_GRACE = 30         # Seconds a stall may last before giving up
+WATCHDOG_EXIT = os.getenv('WATCHDOG_EXIT', 'False').lower() == 'true'  # Exit so a supervisor restarts us
+
 # Warning system settings
 MAX_WARNINGS = 3
+WARNING_EXPIRY_DAYS = 30    # Default days a warning counts; guilds can change it with warnexpiry (0 = never)
+# Default escalation policy: action taken when a member reaches each warning count.
+# Actions: warn, mute, timeout:<duration> (e.g. timeout:1h), quarantine, kick, ban.
+# Counts past the highest threshold repeat its action. Guilds can override with warnpolicy.
 WARNING_ACTIONS = {
     1: "warn",
     2: "mute",
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from utils.logger import setup_logger
+
+logger = setup_logger('AFKIndex')
+
+AFK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS afk (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    since REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+"""
+
+
+class AfkRecord:
+    """One member's AFK status"""
+
+    __slots__ = ('reason', 'since')
+
+    def __init__(self, reason: str, since: float):
+        self.reason = reason
+        self.since = since
+
+
+class AfkIndex:
+    """
+    AFK records indexed per guild and persisted to SQLite
+
+    A guild's records are loaded from the database the first time that guild
+    is touched, so startup cost does not grow with the number of stored
+    entries. Changes apply in memory immediately and are written behind in
+    one batched transaction per flush window; repeated changes to the same
+    member between flushes collapse into a single write.
+    """
+
+    def __init__(self, db, delay: float = 2.0):
+        self.db = db
+        self.delay = delay
+        self._guilds = {}  # guild_id -> {user_id: AfkRecord}; present once loaded, even if empty
+        self._loading = {}  # guild_id -> Future for an in-flight load
+        self._pending = {}  # (guild_id, user_id) -> AfkRecord to upsert, or None to delete
+        self._count = 0
+        self._schema_ready = False
+        self._task = None
+        self._wake = asyncio.Event()
+        self._write_lock = asyncio.Lock()  # One batch in flight at a time
+
+    async def _ensure_schema(self):
+        if not self._schema_ready:
+            await self.db.executescript(AFK_SCHEMA)
+            self._schema_ready = True
+
+    async def records(self, guild_id: int) -> dict:
+        """The guild's {user_id: AfkRecord} mapping, loading it on first use; treat it as read-only"""
+        guild = self._guilds.get(guild_id)
+        if guild is not None:
+            return guild
+
+        loading = self._loading.get(guild_id)
+        if loading is None:
+            loading = self._loading[guild_id] = asyncio.ensure_future(self._load(guild_id))
+        try:
+            return await asyncio.shield(loading)
+        finally:
+            if loading.done():
+                self._loading.pop(guild_id, None)
+
+    async def _load(self, guild_id: int) -> dict:
+        await self._ensure_schema()
+        rows = await self.db.fetchall("SELECT user_id, reason, since FROM afk WHERE guild_id = ?", (guild_id,))
+        guild = self._guilds[guild_id] = {user_id: AfkRecord(reason, since) for user_id, reason, since in rows}
+        self._count += len(guild)
+        return guild
+
+    async def get(self, guild_id: int, user_id: int):
+        return (await self.records(guild_id)).get(user_id)
+
+    async def set(self, guild_id: int, user_id: int, reason: str, since: float = None) -> AfkRecord:
+        guild = await self.records(guild_id)
+        record = AfkRecord(reason, time.time() if since is None else since)
+        if user_id not in guild:
+            self._count += 1
+        guild[user_id] = record
+        self._schedule(guild_id, user_id, record)
+        return record
+
+    async def remove(self, guild_id: int, user_id: int):
+        """Clear a member's AFK status, returning the removed record if there was one"""
+        record = (await self.records(guild_id)).pop(user_id, None)
+        if record is not None:
+            self._count -= 1
+            self._schedule(guild_id, user_id, None)
+        return record
+
+    async def contains(self, guild_id: int, user_id: int) -> bool:
+        return user_id in await self.records(guild_id)
+
+    def _schedule(self, guild_id: int, user_id: int, record):
+        self._pending[(guild_id, user_id)] = record
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._write_behind())
+
+    async def _write_behind(self):
+        # Loops so a failed write is retried on the next window
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._write_pending()
+
+    async def flush(self):
+        """Write every pending change now and wait for it to land"""
+        # Never cancel the write-behind task: a batch it has already taken
+        # would be lost. Waiting on the lock lets an in-flight write finish
+        # (or requeue on failure) before the remainder is written here.
+        await self._write_pending()
+        self._wake.set()
+
+    async def _write_pending(self):
+        async with self._write_lock:
+            await self._write_batch()
+
+    async def _write_batch(self):
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        upserts = [(gid, uid, r.reason, r.since) for (gid, uid), r in pending.items() if r is not None]
+        deletes = [(gid, uid) for (gid, uid), r in pending.items() if r is None]
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO afk (guild_id, user_id, reason, since) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, user_id) DO UPDATE SET reason = excluded.reason, since = excluded.since",
+                upserts
+            )
+            conn.executemany("DELETE FROM afk WHERE guild_id = ? AND user_id = ?", deletes)
+
+        try:
+            await self._ensure_schema()
+            await self.db.run(write)
+        except Exception as e:
+            logger.error(f"Failed to persist {len(pending)} AFK change(s): {e}")
+            # Keep them for the next flush unless a newer change superseded them
+            for key, record in pending.items():
+                self._pending.setdefault(key, record)
+
+    def __len__(self):
+        """Records currently loaded into memory"""
+        return self._count
@@ -0,0 +1,86 @@
+from utils.guild_settings import GuildSettingsStore
+from utils.matcher import WordMatcher
+from utils.normalize import normalize_text
+from config import (
+    BAD_WORDS, AUTOMOD_CAPS_THRESHOLD, AUTOMOD_SPAM_WINDOW,
+    AUTOMOD_SPAM_LIMIT, AUTOMOD_MENTION_LIMIT, FLOOD_USER_THRESHOLD, FLOOD_CHANNEL_THRESHOLD
+)
+
+AUTOMOD_FILE = "data/automod.json"
+
+# Guilds that never customized their word list all share one automaton
+_default_matcher = WordMatcher(normalize_text(w) for w in BAD_WORDS)
+
+
+class GuildAutomodSettings:
+    """Automod settings for a single guild"""
+
+    __slots__ = (
+        'enabled', 'caps_threshold', 'spam_window', 'spam_limit', 'mention_limit',
+        'flood_user_threshold', 'flood_channel_threshold', 'matcher'
+    )
+
+    def __init__(self, enabled=True, bad_words=None, caps_threshold=AUTOMOD_CAPS_THRESHOLD,
+                 spam_window=AUTOMOD_SPAM_WINDOW, spam_limit=AUTOMOD_SPAM_LIMIT,
+                 mention_limit=AUTOMOD_MENTION_LIMIT, flood_user_threshold=FLOOD_USER_THRESHOLD,
+                 flood_channel_threshold=FLOOD_CHANNEL_THRESHOLD):
+        self.enabled = enabled
+        self.caps_threshold = caps_threshold
+        self.spam_window = spam_window
+        self.spam_limit = spam_limit
+        self.mention_limit = mention_limit
+        self.flood_user_threshold = flood_user_threshold
+        self.flood_channel_threshold = flood_channel_threshold
+        if bad_words is None:
+            self.matcher = _default_matcher
+        else:
+            self.matcher = WordMatcher(normalize_text(w) for w in bad_words)
+
+    @property
+    def bad_words(self) -> tuple:
+        return self.matcher.words
+
+    def has_bad_word(self, word: str) -> bool:
+        return normalize_text(word) in self.matcher
+
+    def add_bad_word(self, word: str):
+        """Add a word, swapping in a rebuilt matcher so checks never see a partial one"""
+        self.matcher = self.matcher.with_word(normalize_text(word))
+
+    def remove_bad_word(self, word: str):
+        """Remove a word, swapping in a rebuilt matcher"""
+        self.matcher = self.matcher.without_word(normalize_text(word))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GuildAutomodSettings':
+        return cls(
+            enabled=data.get('enabled', True),
+            bad_words=data.get('bad_words'),
+            caps_threshold=data.get('caps_threshold', AUTOMOD_CAPS_THRESHOLD),
+            spam_window=data.get('spam_window', AUTOMOD_SPAM_WINDOW),
+            spam_limit=data.get('spam_limit', AUTOMOD_SPAM_LIMIT),
+            mention_limit=data.get('mention_limit', AUTOMOD_MENTION_LIMIT),
+            flood_user_threshold=data.get('flood_user_threshold', FLOOD_USER_THRESHOLD),
+            flood_channel_threshold=data.get('flood_channel_threshold', FLOOD_CHANNEL_THRESHOLD),
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            'enabled': self.enabled,
+            'caps_threshold': self.caps_threshold,
+            'spam_window': self.spam_window,
+            'spam_limit': self.spam_limit,
+            'mention_limit': self.mention_limit,
+            'flood_user_threshold': self.flood_user_threshold,
+            'flood_channel_threshold': self.flood_channel_threshold,
+        }
+        if self.matcher is not _default_matcher:
+            data['bad_words'] = list(self.bad_words)
+        return data
+
+
+class AutomodSettingsStore(GuildSettingsStore):
+    """Per-guild automod settings, cached after first lookup and written behind"""
+
+    def __init__(self, path: str = AUTOMOD_FILE):
+        super().__init__(path, GuildAutomodSettings)
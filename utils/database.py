@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import setup_logger
+
+logger = setup_logger('Database')
+
+DATABASE_FILE = "data/bot.db"
+
+
+class Database:
+    """
+    Shared SQLite database accessed from one dedicated worker thread
+
+    Every statement runs on the same thread, so the event loop never blocks
+    on disk I/O and the connection is never used concurrently. The file is
+    opened in WAL mode so reads are not held up behind writes.
+    """
+
+    def __init__(self, path: str = DATABASE_FILE):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Only ever touched from the executor thread
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+            logger.info(f"Opened database {self.path}")
+        return self._conn
+
+    async def run(self, fn, *args):
+        """Run fn(connection, *args) on the database thread inside one transaction"""
+        def call():
+            conn = self._connect()
+            with conn:
+                return fn(conn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def executescript(self, script: str):
+        await self.run(lambda conn: conn.executescript(script))
+
+    async def execute(self, sql: str, params=()) -> int:
+        """Run one statement, returning the affected row count"""
+        return await self.run(lambda conn: conn.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, rows):
+        await self.run(lambda conn: conn.executemany(sql, rows))
+
+    async def fetchall(self, sql: str, params=()) -> list:
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params=()):
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def close(self):
+        def close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, close)
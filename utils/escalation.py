@@ -0,0 +1,104 @@
+import re
+
+# Discord caps member timeouts at 28 days
+MAX_TIMEOUT = 28 * 86400
+
+# Highest warning count a policy may act on; the lookup table is this long at most
+MAX_THRESHOLD = 100
+
+_DURATION_RE = re.compile(r'^(\d+)([smhd])$')
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(text: str):
+    """Parse a compact duration such as 30s, 10m, 1h or 2d into seconds, or None"""
+    match = _DURATION_RE.match(text.strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def format_duration(seconds: int) -> str:
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+class EscalationAction:
+    """One step of an escalation policy, e.g. `ban` or `timeout:1h`"""
+
+    KINDS = ('warn', 'mute', 'timeout', 'quarantine', 'kick', 'ban')
+    REMOVING = ('kick', 'ban')
+
+    __slots__ = ('kind', 'duration')
+
+    def __init__(self, kind: str, duration: int = None):
+        self.kind = kind
+        self.duration = duration
+
+    @classmethod
+    def parse(cls, text: str) -> 'EscalationAction':
+        """Parse `kind` or `timeout:<duration>`, raising ValueError if invalid"""
+        kind, _, argument = text.strip().lower().partition(':')
+        if kind not in cls.KINDS:
+            raise ValueError(f"Unknown action `{kind}`. Use one of: {', '.join(cls.KINDS)}")
+        if kind != 'timeout':
+            if argument:
+                raise ValueError(f"`{kind}` does not take a duration")
+            return cls(kind)
+
+        duration = parse_duration(argument or '1h')
+        if duration is None or not 0 < duration <= MAX_TIMEOUT:
+            raise ValueError("Timeout needs a duration between 1s and 28d, e.g. `timeout:10m`")
+        return cls(kind, duration)
+
+    def __str__(self):
+        return f"timeout:{format_duration(self.duration)}" if self.kind == 'timeout' else self.kind
+
+
+class EscalationPolicy:
+    """
+    Maps warning counts to actions, precompiled into a lookup table
+
+    The table holds one entry per count up to the highest threshold, so a
+    lookup is a single index. Counts past the highest threshold keep
+    getting its action, as reaching MAX_WARNINGS always has.
+    """
+
+    __slots__ = ('thresholds', 'max_warnings', '_table')
+
+    def __init__(self, thresholds: dict):
+        if any(not 1 <= count <= MAX_THRESHOLD for count in thresholds):
+            raise ValueError(f"Warning thresholds must be between 1 and {MAX_THRESHOLD}")
+        self.thresholds = dict(sorted(thresholds.items()))  # {count: EscalationAction}
+        # Highest count that removes the member from the guild, or None if nothing does
+        self.max_warnings = max(
+            (count for count, action in self.thresholds.items() if action.kind in EscalationAction.REMOVING),
+            default=None
+        )
+        size = max(self.thresholds, default=0) + 1
+        self._table = [self.thresholds.get(count) for count in range(size)]
+
+    @classmethod
+    def from_config(cls, mapping: dict) -> 'EscalationPolicy':
+        """Compile a {count: 'action'} mapping such as config.WARNING_ACTIONS"""
+        thresholds = {}
+        for count, action in mapping.items():
+            thresholds[int(count)] = EscalationAction.parse(action)
+        return cls(thresholds)
+
+    def action_for(self, count: int):
+        """The action for a member who just reached count warnings, or None"""
+        if count <= 0 or len(self._table) == 1:
+            return None
+        return self._table[min(count, len(self._table) - 1)]
+
+    def with_threshold(self, count: int, action: EscalationAction) -> 'EscalationPolicy':
+        return EscalationPolicy({**self.thresholds, count: action})
+
+    def without_threshold(self, count: int) -> 'EscalationPolicy':
+        return EscalationPolicy({c: a for c, a in self.thresholds.items() if c != count})
+
+    def to_dict(self) -> dict:
+        return {str(count): str(action) for count, action in self.thresholds.items()}
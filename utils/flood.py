@@ -0,0 +1,101 @@
+from collections import OrderedDict, deque
+
+
+class _GuildWindow:
+    """Time-bucketed content hashes seen recently in one guild"""
+
+    __slots__ = ('buckets', 'flagged', 'size')
+
+    def __init__(self):
+        self.buckets = deque()  # [bucket_start, {content_hash: [(channel_id, author_id, message_id)]}]
+        self.flagged = {}       # content_hash -> time the flag expires
+        self.size = 0
+
+
+class DuplicateFloodDetector:
+    """
+    Detects the same content being posted by many users or in many channels
+
+    Each guild keeps a sliding window split into fixed-size time buckets.
+    Whole buckets are dropped as they age out, so eviction costs nothing per
+    message, and each guild is capped at `max_entries` recorded messages.
+    """
+
+    def __init__(self, window: float = 30.0, bucket_size: float = 5.0, user_threshold: int = 8,
+                 channel_threshold: int = 3, max_entries: int = 5_000, max_guilds: int = 10_000):
+        self.window = window
+        self.bucket_size = bucket_size
+        self.user_threshold = user_threshold
+        self.channel_threshold = channel_threshold
+        self.max_entries = max_entries
+        self.max_guilds = max_guilds
+        self._guilds = OrderedDict()
+
+    def _expire(self, guild: _GuildWindow, now: float):
+        cutoff = now - self.window
+        buckets = guild.buckets
+        while buckets and (buckets[0][0] + self.bucket_size <= cutoff or guild.size > self.max_entries):
+            _, hashes = buckets.popleft()
+            guild.size -= sum(len(entries) for entries in hashes.values())
+
+    def record(self, guild_id: int, content_hash: int, channel_id: int, author_id: int,
+               message_id: int, now: float, user_threshold: int = None, channel_threshold: int = None):
+        """
+        Record a message and return the (channel_id, message_id) pairs to remove
+        if its content is flooding, otherwise None. The thresholds default to
+        the detector's and may be given per call for per-guild settings.
+        """
+        user_threshold = user_threshold or self.user_threshold
+        channel_threshold = channel_threshold or self.channel_threshold
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = _GuildWindow()
+            if len(self._guilds) > self.max_guilds:
+                self._guilds.popitem(last=False)
+        else:
+            self._guilds.move_to_end(guild_id)
+
+        # Content that was already flagged is removed on sight until the flag expires
+        expires = guild.flagged.get(content_hash)
+        if expires is not None:
+            if expires > now:
+                return [(channel_id, message_id)]
+            del guild.flagged[content_hash]
+
+        bucket_start = now - now % self.bucket_size
+        if not guild.buckets or guild.buckets[-1][0] != bucket_start:
+            guild.buckets.append([bucket_start, {}])
+        guild.buckets[-1][1].setdefault(content_hash, []).append((channel_id, author_id, message_id))
+        guild.size += 1
+        self._expire(guild, now)
+
+        entries = [entry for _, hashes in guild.buckets for entry in hashes.get(content_hash, ())]
+        if len(entries) < min(user_threshold, channel_threshold):
+            return None
+
+        users = {entry[1] for entry in entries}
+        channels = {entry[0] for entry in entries}
+        if len(users) < user_threshold and len(channels) < channel_threshold:
+            return None
+
+        for _, hashes in guild.buckets:
+            removed = hashes.pop(content_hash, None)
+            if removed:
+                guild.size -= len(removed)
+        guild.flagged[content_hash] = now + self.window
+        return [(entry[0], entry[2]) for entry in entries]
+
+    def evict_idle(self, now: float) -> int:
+        """Drop guilds with nothing left in their window, returning how many were removed"""
+        idle = []
+        for guild_id, guild in self._guilds.items():
+            self._expire(guild, now)
+            guild.flagged = {h: exp for h, exp in guild.flagged.items() if exp > now}
+            if not guild.buckets and not guild.flagged:
+                idle.append(guild_id)
+        for guild_id in idle:
+            del self._guilds[guild_id]
+        return len(idle)
+
+    def __len__(self):
+        return len(self._guilds)
@@ -0,0 +1,44 @@
+from utils.json_store import JsonStore
+
+
+class GuildSettingsStore:
+    """
+    Per-guild settings objects with a read-through cache
+
+    Raw settings are loaded from disk once. Each guild's settings object is
+    built on first access and cached, so lookups on hot paths are a single
+    dict hit. Changes are written behind through a JsonStore.
+
+    settings_cls must accept no arguments for defaults and provide
+    from_dict/to_dict.
+    """
+
+    def __init__(self, path: str, settings_cls):
+        self.settings_cls = settings_cls
+        self.store = JsonStore(path)
+        self._raw = {int(gid): data for gid, data in self.store.load({}).items()}
+        self._cache = {}
+
+    def snapshot(self) -> dict:
+        return {str(gid): data for gid, data in self._raw.items()}
+
+    async def flush(self):
+        """Write pending changes now"""
+        await self.store.flush()
+
+    def get(self, guild_id: int):
+        """Return settings for a guild, building them on first access"""
+        settings = self._cache.get(guild_id)
+        if settings is None:
+            raw = self._raw.get(guild_id)
+            settings = self.settings_cls.from_dict(raw) if raw else self.settings_cls()
+            self._cache[guild_id] = settings
+        return settings
+
+    def commit(self, guild_id: int):
+        """Persist changes made to a guild's cached settings"""
+        self._raw[guild_id] = self.get(guild_id).to_dict()
+        self.store.save(self.snapshot)
+
+    def __len__(self):
+        return len(self._cache)
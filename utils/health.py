@@ -0,0 +1,165 @@
+import asyncio
+import os
+import threading
+import time
+from aiohttp import web
+from utils.logger import setup_logger
+
+logger = setup_logger('Health')
+
+
+class HealthMonitor:
+    """
+    Liveness and readiness reporting plus a watchdog for wedged processes
+
+    The watchdog runs on the event loop and forces a gateway RESUME when
+    heartbeat ACKs stop arriving; a gateway that stays disconnected past
+    the heartbeat timeout counts as a stall too. A daemon thread notices when the loop
+    itself stops running. If either condition outlasts the grace period and
+    exit_on_stall is set, the process exits so a supervisor can replace it.
+    """
+
+    def __init__(self, bot, heartbeat_timeout: float = 90.0, lag_limit: float = 5.0,
+                 stall_grace: float = 30.0, exit_on_stall: bool = False, interval: float = 5.0):
+        self.bot = bot
+        self.heartbeat_timeout = heartbeat_timeout
+        self.lag_limit = lag_limit
+        self.stall_grace = stall_grace
+        self.exit_on_stall = exit_on_stall
+        self.interval = interval
+        self.cogs_loaded = False
+        self._last_tick = time.monotonic()
+        self._last_connected = time.monotonic()
+        self._stalled_since = None
+        self._reconnected = False
+        self._task = None
+        self._thread = None
+
+    def heartbeat_ack_age(self):
+        """Seconds since the gateway last acknowledged a heartbeat, or None before the first one"""
+        keep_alive = getattr(self.bot.ws, '_keep_alive', None)
+        if keep_alive is None:
+            return None
+        return time.perf_counter() - keep_alive._last_ack
+
+    def is_connected(self) -> bool:
+        ws = self.bot.ws
+        return not self.bot.is_closed() and ws is not None and ws.open
+
+    def disconnected_for(self) -> float:
+        """Seconds since the gateway was last seen connected, 0 while it is"""
+        now = time.monotonic()
+        if self.is_connected():
+            self._last_connected = now
+            return 0.0
+        return now - self._last_connected
+
+    def problems(self) -> list:
+        """Reasons the process should be considered unhealthy"""
+        problems = []
+        # discord.py drops the keep-alive on every disconnect, so a missing
+        # heartbeat only means healthy while the socket is actually up
+        down = self.disconnected_for()
+        if down > self.heartbeat_timeout:
+            problems.append(f"gateway disconnected for {down:.0f}s")
+        age = self.heartbeat_ack_age()
+        if age is not None and age > self.heartbeat_timeout:
+            problems.append(f"no heartbeat ACK for {age:.0f}s")
+        loop_lag = getattr(self.bot, 'loop_lag', None)
+        if loop_lag and loop_lag.lag > self.lag_limit:
+            problems.append(f"event loop lag {loop_lag.lag:.1f}s")
+        return problems
+
+    def status(self) -> dict:
+        age = self.heartbeat_ack_age()
+        loop_lag = getattr(self.bot, 'loop_lag', None)
+        latency = self.bot.latency
+        return {
+            'connected': self.is_connected(),
+            'ready': self.bot.is_ready(),
+            'cogs_loaded': self.cogs_loaded,
+            'heartbeat_ack_age': round(age, 3) if age is not None else None,
+            'gateway_latency': round(latency, 3) if latency == latency else None,
+            'loop_lag': round(loop_lag.lag, 4) if loop_lag else None,
+            'guilds': len(self.bot.guilds),
+        }
+
+    async def handle_healthz(self, request):
+        """Liveness: the loop is serving requests and the gateway is not wedged"""
+        problems = self.problems()
+        body = dict(self.status(), ok=not problems, problems=problems)
+        return web.json_response(body, status=503 if problems else 200)
+
+    async def handle_readyz(self, request):
+        """Readiness: cogs are loaded and the gateway session is up"""
+        problems = self.problems()
+        if not self.cogs_loaded:
+            problems.append("cogs still loading")
+        if not self.is_connected() or not self.bot.is_ready():
+            problems.append("gateway not ready")
+        body = dict(self.status(), ok=not problems, problems=problems)
+        return web.json_response(body, status=503 if problems else 200)
+
+    def start(self):
+        self._last_tick = self._last_connected = time.monotonic()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch_loop, name='loop-watchdog', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            problems = self.problems()
+            if not problems:
+                if self._stalled_since is not None:
+                    logger.info("Watchdog: process recovered")
+                self._stalled_since = None
+                self._reconnected = False
+                continue
+
+            if self._stalled_since is None:
+                self._stalled_since = now
+                logger.warning(f"Watchdog: {', '.join(problems)}")
+
+            age = self.heartbeat_ack_age()
+            if not self._reconnected and age is not None and age > self.heartbeat_timeout and self.bot.ws is not None:
+                # Close code 4000 makes discord.py reconnect and RESUME the session
+                self._reconnected = True
+                logger.warning("Watchdog: forcing a gateway reconnect")
+                try:
+                    await self.bot.ws.close(code=4000)
+                except Exception as e:
+                    logger.error(f"Watchdog: reconnect failed: {e}")
+
+            if now - self._stalled_since > self.stall_grace:
+                self._give_up(f"unhealthy for {now - self._stalled_since:.0f}s: {', '.join(problems)}")
+
+    def _watch_loop(self):
+        """Runs off the loop, so it still fires when the loop is blocked"""
+        warned = False
+        while True:
+            time.sleep(self.interval)
+            stalled = time.monotonic() - self._last_tick - self.interval
+            if stalled <= self.lag_limit:
+                warned = False
+                continue
+            if not warned:
+                warned = True
+                logger.warning(f"Watchdog: event loop unresponsive for {stalled:.1f}s")
+            if stalled > self.stall_grace:
+                self._give_up(f"event loop unresponsive for {stalled:.1f}s")
+
+    def _give_up(self, reason: str):
+        if not self.exit_on_stall:
+            return
+        logger.critical(f"Watchdog: exiting, {reason}")
+        os._exit(1)
@@ -11,13 +11,14 @@ def format_message(content: str) -> str:
     """Format a message with bold styling"""
     return f"**{content}**"
 
-def is_afk(bot, user_id: int) -> bool:
-    """Check if a user is AFK"""
-    return user_id in getattr(bot, 'afk_users', {})
+async def is_afk(bot, guild_id: int, user_id: int) -> bool:
+    """Check if a user is AFK in a guild"""
+    afk_index = getattr(bot, 'afk_index', None)
+    return afk_index is not None and await afk_index.contains(guild_id, user_id)
 
-def get_user_status(bot, user_id: int) -> str:
+async def get_user_status(bot, guild_id: int, user_id: int) -> str:
     """Get user AFK status"""
-    return "AFK" if is_afk(bot, user_id) else "Active"
+    return "AFK" if await is_afk(bot, guild_id, user_id) else "Active"
 
 def log_action(action: str, user: discord.Member):
     """Log an action performed by a user"""
@@ -166,12 +167,15 @@ def extract_id_from_mention(mention: str) -> int:
         return None
 
 class Paginator:
-    """Simple paginator for long lists"""
+    """Simple paginator for long lists (or any sequence that supports len and slicing)"""
     
-    def __init__(self, items: list, per_page: int = 10):
+    def __init__(self, items, per_page: int = 10):
         self.items = items
         self.per_page = per_page
-        self.total_pages = (len(items) + per_page - 1) // per_page
+
+    @property
+    def total_pages(self) -> int:
+        return (len(self.items) + self.per_page - 1) // self.per_page
     
     def get_page(self, page_number: int) -> list:
         """Get items for a specific page (1-indexed)"""
@@ -187,3 +191,63 @@ class Paginator:
         if self.total_pages == 0:
             return "No items"
         return f"Page {page_number}/{self.total_pages} • {len(self.items)} total items"
+
+
+class PaginatorView(discord.ui.View):
+    """
+    Previous/next buttons over a Paginator, building each page only when shown
+
+    render(entries, page_number) returns the embed for one page. Only
+    author_id can turn pages; the buttons are disabled on timeout.
+    """
+
+    def __init__(self, paginator: Paginator, render, author_id: int, timeout: float = 120):
+        super().__init__(timeout=timeout)
+        self.paginator = paginator
+        self.render = render
+        self.author_id = author_id
+        self.page = 1
+        self.message = None
+
+    def current_embed(self) -> discord.Embed:
+        # The underlying sequence may have shrunk since the last page was shown
+        self.page = max(1, min(self.page, self.paginator.total_pages))
+        embed = self.render(self.paginator.get_page(self.page), self.page)
+        embed.set_footer(text=self.paginator.format_page_info(self.page))
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= self.paginator.total_pages
+        return embed
+
+    async def send(self, destination):
+        """Send the first page, attaching buttons only if there is more than one"""
+        embed = self.current_embed()
+        if self.paginator.total_pages <= 1:
+            self.stop()
+            return await destination.send(embed=embed)
+        self.message = await destination.send(embed=embed, view=self)
+        return self.message
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the person who ran this command can turn pages.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await interaction.response.edit_message(embed=self.current_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.current_embed(), view=self)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
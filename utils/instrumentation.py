@@ -0,0 +1,142 @@
+import asyncio
+import bisect
+import functools
+import time
+from utils.logger import setup_logger
+
+logger = setup_logger('Instrumentation')
+
+# Histogram bucket upper bounds in seconds; anything slower lands in the overflow bucket
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram: constant memory no matter how many samples"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile sample"""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class HandlerMetrics:
+    """Latency histograms per (cog, handler), plus a warning log for outliers"""
+
+    def __init__(self, slow_threshold: float = 1.0):
+        self.slow_threshold = slow_threshold
+        self.histograms = {}  # (cog, handler) -> LatencyHistogram
+
+    def observe(self, cog: str, handler: str, seconds: float):
+        histogram = self.histograms.get((cog, handler))
+        if histogram is None:
+            histogram = self.histograms[(cog, handler)] = LatencyHistogram()
+        histogram.observe(seconds)
+        if seconds >= self.slow_threshold:
+            logger.warning(f"Slow handler {cog}.{handler} took {seconds:.3f}s")
+
+    def slowest(self, limit: int = 10) -> list:
+        """(cog, handler, histogram) for the handlers with the worst p99, then max"""
+        ranked = sorted(
+            self.histograms.items(),
+            key=lambda item: (item[1].percentile(99), item[1].max),
+            reverse=True
+        )
+        return [(cog, handler, histogram) for (cog, handler), histogram in ranked[:limit]]
+
+
+class LoopLagMonitor:
+    """
+    Samples event loop lag by sleeping for a fixed interval and measuring
+    how late the wakeup was; anything blocking the loop shows up as lag.
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.25):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.lag = 0.0
+        self.histogram = LatencyHistogram()
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start - self.interval)
+            self.histogram.observe(self.lag)
+            if self.lag >= self.warn_threshold:
+                logger.warning(f"Event loop lagged {self.lag:.3f}s")
+
+
+def timed(func, metrics: HandlerMetrics, cog: str, handler: str):
+    """Wrap a coroutine function so each call is recorded in metrics"""
+    if getattr(func, '__instrumented__', False):
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            metrics.observe(cog, handler, time.perf_counter() - start)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_cog(bot, cog, metrics: HandlerMetrics):
+    """Time a loaded cog's listeners, prefix commands and slash commands"""
+    cog_name = cog.qualified_name
+
+    for event, method in cog.get_listeners():
+        wrapper = timed(method, metrics, cog_name, event)
+        if wrapper is method:
+            continue
+        bot.remove_listener(method, event)
+        bot.add_listener(wrapper, event)
+        # Cog unloading looks listeners up by attribute, so it must find the wrapper
+        setattr(cog, method.__name__, wrapper)
+
+    for command in cog.walk_commands():
+        command.callback = timed(command.callback, metrics, cog_name, f"command:{command.qualified_name}")
+
+    for command in cog.walk_app_commands():
+        if hasattr(command, '_callback'):
+            # app_commands.Command has no public callback setter
+            command._callback = timed(command._callback, metrics, cog_name, f"/{command.qualified_name}")
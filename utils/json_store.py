@@ -0,0 +1,87 @@
+import asyncio
+import os
+import tempfile
+import orjson
+from utils.logger import setup_logger
+
+logger = setup_logger('JsonStore')
+
+
+class JsonStore:
+    """
+    Debounced, atomic write-behind persistence for a single JSON file
+
+    `save` only records a snapshot callable; the first call opens a short
+    window and every save before it closes is coalesced into one write. The
+    snapshot is serialized with orjson on the event loop, then written to a
+    temporary file on a worker thread and renamed over the target, so a
+    crash mid-write never leaves a truncated file behind.
+    """
+
+    def __init__(self, path: str, delay: float = 1.0):
+        self.path = path
+        self.delay = delay
+        self._snapshot = None
+        self._task = None
+        self._wake = asyncio.Event()
+
+    def load(self, default=None):
+        """Read the file synchronously, returning default if it is missing or unreadable"""
+        try:
+            with open(self.path, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return default
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.error(f"Failed to load {self.path}: {e}")
+            return default
+
+    def save(self, snapshot):
+        """Schedule a write of snapshot() after the debounce delay"""
+        self._snapshot = snapshot
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._write_behind())
+
+    async def flush(self):
+        """Write any pending snapshot now and wait for it to land"""
+        if self._task is not None and not self._task.done():
+            self._wake.set()
+            await self._task
+        else:
+            await self._write_pending()
+
+    async def _write_behind(self):
+        while self._snapshot is not None:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._write_pending()
+
+    async def _write_pending(self):
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None:
+            return
+        try:
+            payload = orjson.dumps(snapshot())
+            await asyncio.to_thread(self._write, payload)
+        except Exception as e:
+            logger.error(f"Failed to save {self.path}: {e}")
+
+    def _write(self, payload: bytes):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
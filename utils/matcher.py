@@ -0,0 +1,89 @@
+from collections import deque
+
+
+class WordMatcher:
+    """
+    Aho-Corasick automaton that finds every listed word in a single pass
+
+    Matchers are immutable once built. Use `with_word`/`without_word` to get a
+    rebuilt copy and swap it in, so readers never observe a half-built automaton.
+    """
+
+    __slots__ = ('words', '_goto', '_fail', '_out')
+
+    def __init__(self, words=()):
+        # Preserve insertion order while dropping duplicates and empty entries
+        self.words = tuple(dict.fromkeys(w for w in words if w))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._build()
+
+    def _build(self):
+        goto, out = self._goto, self._out
+
+        # Build the trie
+        for word in self.words:
+            state = 0
+            for char in word:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append(())
+                    goto[state][char] = nxt
+                state = nxt
+            out[state] = out[state] + (word,)
+
+        # Breadth-first pass for failure links, merging outputs along the way
+        fail = self._fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def _scan(self, text):
+        """Yield the output tuple of every matching state in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                yield out[state]
+
+    def search(self, text: str):
+        """Return the first word found in text, or None"""
+        for words in self._scan(text):
+            return words[0]
+        return None
+
+    def find_all(self, text: str) -> set:
+        """Return every distinct word found in text"""
+        found = set()
+        for words in self._scan(text):
+            found.update(words)
+        return found
+
+    def with_word(self, word: str) -> 'WordMatcher':
+        """Return a new matcher that also matches word"""
+        return WordMatcher(self.words + (word,))
+
+    def without_word(self, word: str) -> 'WordMatcher':
+        """Return a new matcher that no longer matches word"""
+        return WordMatcher(w for w in self.words if w != word)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
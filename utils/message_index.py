@@ -0,0 +1,49 @@
+from collections import OrderedDict, deque
+
+
+class RecentMessageIndex:
+    """
+    Per-channel ring buffers of recently seen messages
+
+    Each channel keeps its last `per_channel` messages as
+    (message_id, author_id, timestamp) tuples, and only the `max_channels`
+    most recently active channels are retained.
+    """
+
+    def __init__(self, per_channel: int = 50, max_channels: int = 10_000):
+        self.per_channel = per_channel
+        self.max_channels = max_channels
+        self._channels = OrderedDict()
+
+    def record(self, channel_id: int, message_id: int, author_id: int, timestamp: float):
+        """Remember a message seen in a channel"""
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            buffer = self._channels[channel_id] = deque(maxlen=self.per_channel)
+            if len(self._channels) > self.max_channels:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel_id)
+        buffer.append((message_id, author_id, timestamp))
+
+    def pop_author_messages(self, channel_id: int, author_id: int, since: float) -> list:
+        """Remove and return IDs of an author's messages in a channel newer than since"""
+        buffer = self._channels.get(channel_id)
+        if not buffer:
+            return []
+
+        matched = []
+        kept = []
+        for entry in buffer:
+            if entry[1] == author_id and entry[2] > since:
+                matched.append(entry[0])
+            else:
+                kept.append(entry)
+
+        if matched:
+            buffer.clear()
+            buffer.extend(kept)
+        return matched
+
+    def __len__(self):
+        return len(self._channels)
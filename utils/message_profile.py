@@ -0,0 +1,49 @@
+import re
+from utils.normalize import normalize_text
+
+_TOKEN_RE = re.compile(r'\w+')
+_ASCII_UPPER = bytes(range(ord('A'), ord('Z') + 1))
+
+
+def count_uppercase(text: str) -> int:
+    """Count uppercase characters without a Python-level loop"""
+    if text.isascii():
+        # bytes.translate deletes in C, so the length difference is the uppercase count
+        raw = text.encode('ascii')
+        return len(raw) - len(raw.translate(None, _ASCII_UPPER))
+    return sum(map(str.isupper, text))
+
+
+class MessageProfile:
+    """Facts about a message computed once and shared by every automod check"""
+
+    __slots__ = ('content', 'length', 'uppercase', 'mention_count', '_tokens')
+
+    def __init__(self, content: str, mention_count: int = 0):
+        self.content = content
+        self.length = len(content)
+        self.uppercase = count_uppercase(content)
+        self.mention_count = mention_count
+        self._tokens = None
+
+    @classmethod
+    def from_message(cls, message) -> 'MessageProfile':
+        """Build a profile from a discord message"""
+        return cls(message.content, len(message.mentions))
+
+    @property
+    def caps_ratio(self) -> float:
+        """Fraction of characters that are uppercase"""
+        return self.uppercase / self.length if self.length else 0.0
+
+    @property
+    def normalized(self) -> str:
+        """Content folded for filter matching (memoized across messages)"""
+        return normalize_text(self.content)
+
+    @property
+    def tokens(self) -> list:
+        """Normalized word tokens, tokenized on first use"""
+        if self._tokens is None:
+            self._tokens = _TOKEN_RE.findall(self.normalized)
+        return self._tokens
@@ -0,0 +1,146 @@
+import logging
+from collections import Counter
+from aiohttp import web
+from utils.logger import setup_logger
+from utils.instrumentation import LATENCY_BUCKETS
+
+logger = setup_logger('Metrics')
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+class RateLimitCounter(logging.Handler):
+    """Counts the 429 warnings discord.py logs, since it exposes no event for them"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.counts = Counter()
+
+    def emit(self, record):
+        message = record.msg if isinstance(record.msg, str) else ''
+        if message.startswith('Global rate limit'):
+            # discord.py logs the route line first for the same response, with
+            # no await in between, so reclassify that 429 rather than count it twice
+            if self.counts['route']:
+                self.counts['route'] -= 1
+            self.counts['global'] += 1
+        elif message.startswith('We are being rate limited'):
+            self.counts['route'] += 1
+
+
+class MetricsServer:
+    """
+    Optional HTTP server exposing bot metrics at /metrics in Prometheus text format
+
+    Counters are exported as running totals; graph them with rate() to get
+    per-second throughput. Cache sizes are read at scrape time from callables
+    registered with add_cache, so nothing is computed between scrapes.
+    """
+
+    def __init__(self, bot, host: str = '127.0.0.1', port: int = 9100):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.event_counts = Counter()
+        self.rate_limits = RateLimitCounter()
+        self.caches = {}  # name -> callable returning an entry count
+        self.app = web.Application()
+        self.app.router.add_get('/metrics', self.handle_metrics)
+        self._runner = None
+
+    def add_cache(self, name: str, size):
+        """Export size() as the entry count of a named cache"""
+        self.caches[name] = size
+
+    async def start(self):
+        self.bot.add_listener(self.on_socket_event_type, 'on_socket_event_type')
+        logging.getLogger('discord.http').addHandler(self.rate_limits)
+
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        self.bot.remove_listener(self.on_socket_event_type, 'on_socket_event_type')
+        logging.getLogger('discord.http').removeHandler(self.rate_limits)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def on_socket_event_type(self, event_type: str):
+        self.event_counts[event_type] += 1
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.render(), content_type='text/plain', charset='utf-8')
+
+    def render(self) -> str:
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(**labels)} {value}")
+
+        def histogram(name, hist, **labels):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+            lines.append(f"{name}_sum{_labels(**labels)} {hist.total}")
+            lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        bot = self.bot
+        latency = bot.latency
+        metric('discord_gateway_latency_seconds', 'gauge', "Gateway heartbeat latency",
+               [({}, latency if latency == latency else 0.0)])  # NaN before the first heartbeat
+        metric('discord_guilds', 'gauge', "Guilds the bot is in", [({}, len(bot.guilds))])
+
+        loop_lag = getattr(bot, 'loop_lag', None)
+        if loop_lag:
+            metric('discord_loop_lag_seconds', 'gauge', "Most recent event loop lag sample", [({}, loop_lag.lag)])
+            lines.append("# HELP discord_loop_lag_sample_seconds Event loop lag samples")
+            lines.append("# TYPE discord_loop_lag_sample_seconds histogram")
+            histogram('discord_loop_lag_sample_seconds', loop_lag.histogram)
+
+        metric('discord_gateway_events_total', 'counter', "Gateway dispatch events received by type",
+               [({'type': event}, count) for event, count in sorted(self.event_counts.items())])
+
+        metrics = getattr(bot, 'handler_metrics', None)
+        if metrics:
+            handlers = sorted(metrics.histograms.items())
+            metric('discord_commands_total', 'counter', "Prefix and slash command invocations",
+                   [({'cog': cog, 'command': handler}, hist.count) for (cog, handler), hist in handlers
+                    if handler.startswith(('command:', '/'))])
+            lines.append("# HELP discord_handler_duration_seconds Listener, command and message stage latency")
+            lines.append("# TYPE discord_handler_duration_seconds histogram")
+            for (cog, handler), hist in handlers:
+                histogram('discord_handler_duration_seconds', hist, cog=cog, handler=handler)
+
+        automod = bot.get_cog('AutoModeration')
+        if automod:
+            metric('discord_automod_actions_total', 'counter', "Messages actioned by automod by reason",
+                   [({'reason': reason}, count) for reason, count in sorted(automod.action_counts.items())])
+
+        metric('discord_rest_ratelimits_total', 'counter', "REST responses with status 429",
+               [({'scope': scope}, self.rate_limits.counts[scope]) for scope in ('route', 'global')])
+
+        samples = []
+        for name, size in self.caches.items():
+            try:
+                samples.append(({'cache': name}, size()))
+            except Exception as e:
+                logger.warning(f"Failed to read cache size for {name}: {e}")
+        metric('discord_cache_entries', 'gauge', "Entries held in in-memory caches", samples)
+
+        return '\n'.join(lines) + '\n'
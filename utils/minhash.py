@@ -0,0 +1,183 @@
+from array import array
+from collections import OrderedDict, deque
+
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK
+
+
+class MinHasher:
+    """
+    One-permutation MinHash over character shingles
+
+    Each shingle is hashed once and binned into one of `num_perm` slots,
+    keeping the minimum per slot; empty slots borrow from the next filled
+    one. This gives a `num_perm`-length signature usable for Jaccard
+    estimation and LSH banding at the cost of a single hash per shingle.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 4):
+        if num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._bin_mask = num_perm - 1
+        self._bin_bits = num_perm.bit_length() - 1
+
+    def signature(self, text: str) -> array:
+        """Return the signature of text as an array of unsigned 64-bit ints"""
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+        sig = [_EMPTY] * self.num_perm
+        mask, bits = self._bin_mask, self._bin_bits
+        for shingle in shingles:
+            h = hash(shingle) & _MASK
+            slot = h & mask
+            value = h >> bits
+            if value < sig[slot]:
+                sig[slot] = value
+
+        # Densify: fill empty slots from the next filled slot, offset so they stay distinct
+        if _EMPTY in sig:
+            n = self.num_perm
+            for i in range(n):
+                if sig[i] == _EMPTY:
+                    for step in range(1, n):
+                        donor = sig[(i + step) % n]
+                        if donor != _EMPTY:
+                            sig[i] = (donor + step) & _MASK
+                            break
+        return array('Q', sig)
+
+    @staticmethod
+    def similarity(a: array, b: array) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _choose_bands(num_perm: int, threshold: float) -> int:
+    """
+    Pick the band count for LSH
+
+    Prefers the highest band threshold (1/b)^(1/r) at or below threshold, so
+    candidates err towards recall and are then confirmed by full comparison.
+    """
+    best, best_threshold = num_perm, 0.0
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        band_threshold = (1 / bands) ** (1 / rows)
+        if best_threshold < band_threshold <= threshold:
+            best, best_threshold = bands, band_threshold
+    return best
+
+
+class _GuildIndex:
+    """Recent signatures for one guild plus their LSH band tables"""
+
+    __slots__ = ('entries', 'tables')
+
+    def __init__(self):
+        self.entries = deque()  # (signature, band_keys, channel_id, author_id, message_id, timestamp)
+        self.tables = {}        # band key -> list of entries sharing that band
+
+
+class NearDuplicateDetector:
+    """
+    Finds lightly edited copies of recent messages using MinHash and LSH
+
+    Every guild keeps at most `per_guild` signatures from the last `window`
+    seconds. A message is flagged when near-duplicates (estimated Jaccard
+    similarity >= `threshold`) have been posted by `user_threshold`
+    distinct users.
+    """
+
+    def __init__(self, threshold: float = 0.7, user_threshold: int = 3, window: float = 60.0,
+                 num_perm: int = 64, shingle_size: int = 4, per_guild: int = 500,
+                 max_guilds: int = 10_000):
+        self.threshold = threshold
+        self.user_threshold = user_threshold
+        self.window = window
+        self.per_guild = per_guild
+        self.max_guilds = max_guilds
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands = _choose_bands(num_perm, threshold)
+        self.rows = num_perm // self.bands
+        self._guilds = OrderedDict()
+
+    def _band_keys(self, sig: array) -> list:
+        rows = self.rows
+        return [(band, sig[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    @staticmethod
+    def _unlink(index: _GuildIndex, entry):
+        for key in entry[1]:
+            bucket = index.tables.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(entry)
+            except ValueError:
+                pass
+            if not bucket:
+                del index.tables[key]
+
+    def _expire(self, index: _GuildIndex, now: float):
+        cutoff = now - self.window
+        entries = index.entries
+        while entries and (entries[0][5] <= cutoff or len(entries) > self.per_guild):
+            self._unlink(index, entries.popleft())
+
+    def record(self, guild_id: int, text: str, channel_id: int, author_id: int,
+               message_id: int, now: float):
+        """
+        Record a message and return the (channel_id, message_id) pairs to remove
+        if it belongs to a near-duplicate cluster, otherwise None
+        """
+        index = self._guilds.get(guild_id)
+        if index is None:
+            index = self._guilds[guild_id] = _GuildIndex()
+            if len(self._guilds) > self.max_guilds:
+                self._guilds.popitem(last=False)
+        else:
+            self._guilds.move_to_end(guild_id)
+        self._expire(index, now)
+
+        sig = self.hasher.signature(text)
+        keys = self._band_keys(sig)
+
+        # Collect LSH candidates, then confirm them against the full signature
+        candidates = {}
+        for key in keys:
+            for entry in index.tables.get(key, ()):
+                candidates[id(entry)] = entry
+        matches = [e for e in candidates.values() if MinHasher.similarity(sig, e[0]) >= self.threshold]
+
+        entry = (sig, keys, channel_id, author_id, message_id, now)
+        users = {e[3] for e in matches}
+        users.add(author_id)
+        if len(users) >= self.user_threshold:
+            # Drop the whole cluster so it is acted on once
+            for match in matches:
+                self._unlink(index, match)
+                index.entries.remove(match)
+            return [(e[2], e[4]) for e in matches] + [(channel_id, message_id)]
+
+        index.entries.append(entry)
+        for key in keys:
+            index.tables.setdefault(key, []).append(entry)
+        return None
+
+    def evict_idle(self, now: float) -> int:
+        """Drop guilds with no signatures left in their window, returning how many were removed"""
+        idle = []
+        for guild_id, index in self._guilds.items():
+            self._expire(index, now)
+            if not index.entries:
+                idle.append(guild_id)
+        for guild_id in idle:
+            del self._guilds[guild_id]
+        return len(idle)
+
+    def __len__(self):
+        return len(self._guilds)
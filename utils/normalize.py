@@ -0,0 +1,82 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Characters that render as nothing and are used to split words invisibly
+_INVISIBLE = (
+    '\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e'
+    '\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff'
+)
+
+# Mentions, channel links, custom emoji and URLs carry IDs and paths, not words
+_MARKUP_RE = re.compile(
+    r'<a?:\w+:\d+>|<(?:@[!&]?|#)\d+>|https?://\S+|(?:www\.|discord(?:app)?\.(?:gg|com/invite)/)\S+',
+    re.IGNORECASE
+)
+
+# Look-alike letters from other scripts
+_CONFUSABLES = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p',
+    'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'і': 'i', 'ї': 'i', 'ј': 'j', 'ԁ': 'd',
+    'ԛ': 'q', 'ԝ': 'w', 'ɡ': 'g', 'һ': 'h',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'ν': 'v', 'ο': 'o', 'ρ': 'p',
+    'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+    # Latin variants NFKD leaves alone
+    'ł': 'l', 'ø': 'o', 'đ': 'd', 'ħ': 'h', 'ı': 'i', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe',
+}
+
+# Leetspeak, only applied inside tokens that also contain letters ("h3ll0", "5pam")
+_LEET = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '9': 'g',
+    '@': 'a', '$': 's', '!': 'i', '|': 'l', '€': 'e', '£': 'l',
+}
+_LEET_TABLE = str.maketrans(_LEET)
+_TOKEN_CHARS = r'\w' + re.escape(''.join(ch for ch in _LEET if not ch.isalnum()))
+_TOKEN_RE = re.compile(f'[{_TOKEN_CHARS}]+')
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+# One table applied in C: drop invisibles and combining marks, map look-alikes
+_TRANSLATION = str.maketrans({
+    **{ch: None for ch in _INVISIBLE},
+    **{chr(cp): None for cp in range(0x0300, 0x0370)},
+    **_CONFUSABLES,
+})
+
+# Runs of single characters split by separators, e.g. "b a d" or "b.a.d"
+_SEPARATORS = ' \t\n._-*~/\\,:;+=\'"`^'
+_SPACED_OUT_RE = re.compile(
+    f'(?<![{_TOKEN_CHARS}])(?:[{_TOKEN_CHARS}][{re.escape(_SEPARATORS)}]+){{2,}}[{_TOKEN_CHARS}](?![{_TOKEN_CHARS}])'
+)
+_SEPARATOR_TABLE = str.maketrans('', '', _SEPARATORS)
+
+
+def _join_spaced(match) -> str:
+    return match.group().translate(_SEPARATOR_TABLE)
+
+
+def _fold_leet(match) -> str:
+    token = match.group()
+    # Pure numbers ("1455", "2024") are left alone
+    return token.translate(_LEET_TABLE) if _LETTER_RE.search(token) else token
+
+
+@lru_cache(maxsize=8192)
+def normalize_text(text: str) -> str:
+    """
+    Fold text into a canonical form for filter matching
+
+    Drops mentions, custom emoji and URLs, applies NFKD compatibility
+    decomposition (for non-ASCII text), strips combining marks and zero-width
+    characters, maps homoglyphs to plain letters, lowercases, joins words
+    that were spaced out one character at a time, and maps leetspeak inside
+    tokens that contain letters.
+    """
+    if '<' in text or '/' in text or '.' in text:
+        text = _MARKUP_RE.sub(' ', text)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+    text = text.lower().translate(_TRANSLATION)
+    text = _SPACED_OUT_RE.sub(_join_spaced, text)
+    return _TOKEN_RE.sub(_fold_leet, text)
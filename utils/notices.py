@@ -0,0 +1,68 @@
+import asyncio
+import discord
+from utils.logger import setup_logger
+
+logger = setup_logger('Notices')
+
+
+class NoticeAggregator:
+    """
+    Batches moderation notices per channel into a single embed
+
+    The first notice in a channel opens a short window; every notice that
+    arrives before it closes is folded into the same embed, so a raid costs
+    one message per channel per window instead of one per violation.
+    """
+
+    def __init__(self, title: str, delay: float = 2.0, delete_after: float = 5.0, max_lines: int = 15,
+                 color: discord.Color = discord.Color.orange()):
+        self.title = title
+        self.delay = delay
+        self.delete_after = delete_after
+        self.max_lines = max_lines
+        self.color = color
+        self._pending = {}  # channel_id -> (channel, {user_id: (mention, [reasons])})
+        self._tasks = {}
+
+    def notify(self, channel, user, reason: str):
+        """Queue a notice that user's message in channel was actioned for reason"""
+        pending = self._pending.get(channel.id)
+        if pending is None:
+            pending = self._pending[channel.id] = (channel, {})
+            self._tasks[channel.id] = asyncio.create_task(self._flush_later(channel.id))
+
+        mention, reasons = pending[1].setdefault(user.id, (user.mention, []))
+        if reason not in reasons:
+            reasons.append(reason)
+
+    def build_embed(self, entries: dict) -> discord.Embed:
+        """Build the combined notice embed for one channel"""
+        lines = [f"{mention} — {', '.join(reasons)}" for mention, reasons in entries.values()]
+        description = "\n".join(lines[:self.max_lines])
+        if len(lines) > self.max_lines:
+            description += f"\n... and {len(lines) - self.max_lines} more"
+        return discord.Embed(title=self.title, description=description, color=self.color)
+
+    async def _flush_later(self, channel_id: int):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._tasks.pop(channel_id, None)
+            channel, entries = self._pending.pop(channel_id, (None, None))
+
+        if not entries:
+            return
+        try:
+            await channel.send(embed=self.build_embed(entries), delete_after=self.delete_after)
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to send notice in {channel}: {e}")
+
+    def close(self):
+        """Cancel every pending flush without sending"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,151 @@
+import asyncio
+import time
+import discord
+from utils.logger import setup_logger
+
+logger = setup_logger('Overwrites')
+
+# Channel overwrites for the Muted role
+MUTE_OVERWRITES = {'send_messages': False, 'speak': False}
+
+MAX_ATTEMPTS = 3
+
+
+class OverwriteJob:
+    """
+    One role's overwrite sweep across a set of channels
+
+    total counts only channels that needed a change when the job started;
+    channels with nothing left unset are counted in skipped up front.
+    """
+
+    __slots__ = ('role', 'total', 'updated', 'skipped', 'failed', 'task')
+
+    def __init__(self, role, total: int, skipped: int):
+        self.role = role
+        self.total = total
+        self.updated = 0
+        self.skipped = skipped
+        self.failed = []  # Channels that could not be updated
+        self.task = None
+
+    @property
+    def done(self) -> int:
+        return self.updated + len(self.failed)
+
+    def format_progress(self) -> str:
+        text = f"{self.done}/{self.total} channel(s)"
+        return f"{text}, {len(self.failed)} failed" if self.failed else text
+
+    async def wait(self) -> 'OverwriteJob':
+        if self.task is not None:
+            await asyncio.shield(self.task)
+        return self
+
+
+class OverwriteEngine:
+    """
+    Applies a role's permission overwrites across many channels concurrently
+
+    Only permissions the channel leaves unset are filled in. Explicit values,
+    such as letting Muted members talk in an appeals channel, are never
+    overwritten, and channels with nothing unset are skipped without a
+    request, so re-running a sweep after an interruption only touches the
+    channels it had not reached: every sweep is resumable by simply starting
+    it again.
+    Requests share one semaphore across all guilds to stay well inside the
+    global rate limit, while discord.py's HTTP client waits out each
+    channel's own bucket. A second full-guild sweep for a role that is
+    already being swept joins the running one.
+    """
+
+    def __init__(self, concurrency: int = 5, progress_interval: float = 2.0):
+        self.progress_interval = progress_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs = {}  # role_id -> running OverwriteJob
+
+    def apply(self, role, overwrites, channels=None, reason: str = None, progress=None) -> OverwriteJob:
+        """
+        Start bringing channels (default: all of the role's guild) in line with
+        overwrites, a dict of permission values or a callable returning one per
+        channel (None to leave the channel alone). progress, if given, is an
+        async callable awaited with the job every progress_interval seconds and
+        once at the end.
+        """
+        full_sweep = channels is None
+        if full_sweep and role.id in self._jobs:
+            return self._jobs[role.id]
+
+        channels = role.guild.channels if full_sweep else channels
+        pending = []
+        for channel in channels:
+            desired = overwrites(channel) if callable(overwrites) else overwrites
+            if not desired:
+                continue
+            current = channel.overwrites_for(role)
+            # Only fill unset permissions; an explicit value is a deliberate per-channel choice
+            missing = {name: value for name, value in desired.items() if getattr(current, name) is None}
+            if missing:
+                current.update(**missing)
+                pending.append((channel, current))
+
+        job = OverwriteJob(role, len(pending), len(channels) - len(pending))
+        if pending:
+            if full_sweep:
+                self._jobs[role.id] = job
+            job.task = asyncio.create_task(self._run(job, pending, reason, progress))
+        return job
+
+    async def _run(self, job, pending, reason, progress):
+        reporter = asyncio.create_task(self._report(job, progress)) if progress else None
+        started = time.monotonic()
+        try:
+            await asyncio.gather(*(self._apply_one(job, channel, overwrite, reason) for channel, overwrite in pending))
+        finally:
+            if self._jobs.get(job.role.id) is job:
+                del self._jobs[job.role.id]
+            if reporter is not None:
+                reporter.cancel()
+        logger.info(
+            f"Overwrites for {job.role.name} in {job.role.guild}: {job.format_progress()} "
+            f"in {time.monotonic() - started:.1f}s ({job.skipped} already set)"
+        )
+        if progress:
+            try:
+                await progress(job)
+            except discord.HTTPException:
+                pass
+
+    async def _report(self, job, progress):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            try:
+                await progress(job)
+            except discord.HTTPException:
+                pass
+
+    async def _apply_one(self, job, channel, overwrite, reason):
+        if not channel.permissions_for(channel.guild.me).manage_roles:
+            job.failed.append(channel)
+            return
+
+        async with self._semaphore:
+            for attempt in range(MAX_ATTEMPTS):
+                try:
+                    await channel.set_permissions(job.role, overwrite=overwrite, reason=reason)
+                    job.updated += 1
+                    return
+                except discord.NotFound:
+                    # Channel deleted mid-sweep
+                    job.skipped += 1
+                    job.total -= 1
+                    return
+                except discord.RateLimited as e:
+                    await asyncio.sleep(e.retry_after)
+                except discord.HTTPException as e:
+                    if e.status < 500:
+                        break
+                    await asyncio.sleep(2 ** attempt)
+
+        logger.warning(f"Could not set overwrites for {job.role.name} in #{channel}")
+        job.failed.append(channel)
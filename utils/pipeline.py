@@ -0,0 +1,81 @@
+import bisect
+import time
+from utils.logger import setup_logger
+from utils.message_profile import MessageProfile
+
+logger = setup_logger('MessagePipeline')
+
+# Stage order: lower runs first
+STAGE_AUTOMOD = 20
+STAGE_AFK = 30
+STAGE_MENTION_REPLY = 40
+STAGE_COMMANDS = 50
+
+
+class MessageContext:
+    """Per-message facts computed once and shared by every pipeline stage"""
+
+    __slots__ = ('message', 'guild', 'author', 'mentions', 'mention_ids', 'mentions_bot', '_profile')
+
+    def __init__(self, message, bot_user=None):
+        self.message = message
+        self.guild = message.guild
+        self.author = message.author
+        self.mentions = message.mentions
+        self.mention_ids = {user.id for user in self.mentions}
+        self.mentions_bot = bot_user is not None and bot_user.id in self.mention_ids
+        self._profile = None
+
+    @property
+    def profile(self) -> MessageProfile:
+        """Content analysis for automod, built on first use"""
+        if self._profile is None:
+            self._profile = MessageProfile(self.message.content, len(self.mentions))
+        return self._profile
+
+
+class MessagePipeline:
+    """
+    Ordered, early-exit handling for incoming messages
+
+    Stages are coroutines taking a MessageContext. They run in order, and a
+    stage that returns True stops the message from reaching later stages.
+    Bot authors are filtered out before any stage runs. With metrics set,
+    each stage's latency is recorded under the cog that registered it.
+    """
+
+    def __init__(self, bot, metrics=None):
+        self.bot = bot
+        self.metrics = metrics
+        self._stages = []  # sorted (order, name, handler, owner)
+
+    def register(self, name: str, handler, order: int):
+        """Add or replace a stage"""
+        self.unregister(name)
+        owner = getattr(getattr(handler, '__self__', None), 'qualified_name', 'bot')
+        bisect.insort(self._stages, (order, name, handler, owner), key=lambda stage: (stage[0], stage[1]))
+
+    def unregister(self, name: str):
+        self._stages = [stage for stage in self._stages if stage[1] != name]
+
+    @property
+    def stages(self) -> list:
+        return [name for _, name, _, _ in self._stages]
+
+    async def dispatch(self, message):
+        """Run a message through every stage"""
+        if message.author.bot:
+            return
+
+        ctx = MessageContext(message, self.bot.user)
+        metrics = self.metrics
+        for _, name, handler, owner in self._stages:
+            start = time.perf_counter()
+            try:
+                if await handler(ctx):
+                    return
+            except Exception as e:
+                logger.error(f"Message stage {name} failed: {e}", exc_info=True)
+            finally:
+                if metrics is not None:
+                    metrics.observe(owner, f"on_message:{name}", time.perf_counter() - start)
@@ -0,0 +1,112 @@
+import sys
+from collections import OrderedDict, deque
+
+
+class RateTracker:
+    """
+    Sliding-window event counter keyed by arbitrary hashable keys
+
+    Each key keeps a bounded deque of recent timestamps, so updates are O(1)
+    amortized. Keys are held in LRU order: the oldest are dropped once
+    `max_keys` is exceeded, and `evict_idle` removes keys that have not been
+    hit within the window.
+
+    `window` and `limit` are defaults that individual calls may override;
+    `window` should be the largest window any caller uses, since idle
+    eviction is based on it.
+    """
+
+    def __init__(self, window: float = 10.0, limit: int = 5, max_keys: int = 100_000):
+        self.window = window
+        self.limit = limit
+        self.max_keys = max_keys
+        # Only limit + 1 timestamps are ever needed to tell if the limit was crossed
+        self._events = OrderedDict()
+
+    def hit(self, key, now: float, window: float = None, limit: int = None) -> int:
+        """Record an event for key and return how many fall inside the window"""
+        window = window or self.window
+        limit = limit or self.limit
+        events = self._events.get(key)
+        if events is None:
+            events = self._events[key] = deque(maxlen=limit + 1)
+            if len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+        else:
+            if events.maxlen != limit + 1:
+                # The limit for this key changed; resize while keeping recent events
+                events = self._events[key] = deque(events, maxlen=limit + 1)
+            self._events.move_to_end(key)
+
+        events.append(now)
+        cutoff = now - window
+        while events[0] <= cutoff:
+            events.popleft()
+        return len(events)
+
+    def exceeded(self, key, now: float, window: float = None, limit: int = None) -> bool:
+        """Record an event for key and report whether it went over the limit"""
+        return self.hit(key, now, window, limit) > (limit or self.limit)
+
+    def reset(self, key):
+        """Forget all events for key"""
+        self._events.pop(key, None)
+
+    def evict_idle(self, now: float) -> int:
+        """Drop keys with no events inside the window, returning how many were removed"""
+        cutoff = now - self.window
+        removed = 0
+        # Keys are in least-recently-hit order, so stop at the first live one
+        while self._events:
+            key, events = next(iter(self._events.items()))
+            if events and events[-1] > cutoff:
+                break
+            self._events.popitem(last=False)
+            removed += 1
+        return removed
+
+    def memory_size(self) -> int:
+        """Approximate memory held by the tracker in bytes"""
+        size = sys.getsizeof(self._events)
+        for key, events in self._events.items():
+            size += sys.getsizeof(key) + sys.getsizeof(events)
+        return size
+
+    def __len__(self):
+        return len(self._events)
+
+    def __contains__(self, key):
+        return key in self._events
+
+
+class CooldownMap:
+    """
+    Fixed cooldowns keyed by arbitrary hashable keys
+
+    Keys are kept in trigger order, and every key shares the same period, so
+    expired keys are always at the front and are pruned as new ones arrive.
+    Memory is bounded by `max_keys` as well.
+    """
+
+    def __init__(self, period: float, max_keys: int = 50_000):
+        self.period = period
+        self.max_keys = max_keys
+        self._expires = OrderedDict()  # key -> time the cooldown ends
+
+    def ready(self, key, now: float) -> bool:
+        """Whether key is off cooldown (does not start a new one)"""
+        expires = self._expires.get(key)
+        return expires is None or expires <= now
+
+    def trigger(self, key, now: float):
+        """Start key's cooldown"""
+        self._expires.pop(key, None)
+        self._expires[key] = now + self.period
+        while self._expires:
+            oldest, expires = next(iter(self._expires.items()))
+            if expires > now and len(self._expires) <= self.max_keys:
+                break
+            del self._expires[oldest]
+
+    def __len__(self):
+        return len(self._expires)
@@ -0,0 +1,95 @@
+import discord
+from utils.json_store import JsonStore
+from utils.logger import setup_logger
+
+logger = setup_logger('RoleRegistry')
+
+ROLE_REGISTRY_FILE = "data/roles.json"
+
+ROLE_MUTE = 'mute'
+ROLE_QUARANTINE = 'quarantine'
+ROLE_AUTO = 'auto'
+
+# Default names for roles the bot creates itself; existing roles with these
+# names are adopted the first time a guild is looked up
+ROLE_NAMES = {
+    ROLE_MUTE: "Muted",
+    ROLE_QUARANTINE: "Quarantined",
+}
+
+
+class RoleRegistry:
+    """
+    Per-guild role IDs by purpose (mute, quarantine, auto), persisted to disk
+
+    Lookups are a dict hit plus guild.get_role, so renaming a role does not
+    break anything. Guilds set up before the registry existed have their
+    Muted/Quarantined role adopted by name once; after that the role list is
+    never scanned. Deleted roles are dropped via on_guild_role_delete.
+    """
+
+    def __init__(self, path: str = ROLE_REGISTRY_FILE):
+        self.store = JsonStore(path)
+        self._roles = {int(gid): roles for gid, roles in self.store.load({}).items()}  # guild_id -> {purpose: role_id}
+        self._adoption_checked = set()  # (guild_id, purpose) already scanned for a legacy role
+
+    def snapshot(self) -> dict:
+        return {str(gid): roles for gid, roles in self._roles.items()}
+
+    async def flush(self):
+        """Write pending changes now"""
+        await self.store.flush()
+
+    def get_id(self, guild_id: int, purpose: str):
+        return self._roles.get(guild_id, {}).get(purpose)
+
+    def get(self, guild, purpose: str):
+        """The guild's role for purpose, or None if none is registered or it no longer exists"""
+        role_id = self.get_id(guild.id, purpose)
+        if role_id is not None:
+            role = guild.get_role(role_id)
+            if role is not None:
+                return role
+            self.remove(guild.id, purpose)
+
+        name = ROLE_NAMES.get(purpose)
+        if name is None or (guild.id, purpose) in self._adoption_checked:
+            return None
+        self._adoption_checked.add((guild.id, purpose))
+        role = discord.utils.get(guild.roles, name=name)
+        if role is not None:
+            self.set(guild.id, purpose, role.id)
+            logger.info(f"Adopted existing {name} role in {guild}")
+        return role
+
+    async def ensure(self, guild, purpose: str, **create_kwargs):
+        """Return the guild's role for purpose, creating and registering it if needed"""
+        role = self.get(guild, purpose)
+        if role is None:
+            role = await guild.create_role(name=ROLE_NAMES[purpose], **create_kwargs)
+            self.set(guild.id, purpose, role.id)
+            logger.info(f"Created {role.name} role in {guild}")
+        return role
+
+    def set(self, guild_id: int, purpose: str, role_id: int):
+        self._roles.setdefault(guild_id, {})[purpose] = role_id
+        self.store.save(self.snapshot)
+
+    def remove(self, guild_id: int, purpose: str):
+        """Unregister a purpose, returning the role ID it pointed to"""
+        roles = self._roles.get(guild_id, {})
+        role_id = roles.pop(purpose, None)
+        if role_id is not None:
+            if not roles:
+                del self._roles[guild_id]
+            self.store.save(self.snapshot)
+        return role_id
+
+    async def on_guild_role_delete(self, role):
+        roles = self._roles.get(role.guild.id, {})
+        for purpose in [p for p, role_id in roles.items() if role_id == role.id]:
+            self.remove(role.guild.id, purpose)
+            logger.info(f"Unregistered deleted {purpose} role {role.name} in {role.guild}")
+
+    def __len__(self):
+        return sum(len(roles) for roles in self._roles.values())
@@ -0,0 +1,100 @@
+import asyncio
+import heapq
+import time
+from utils.logger import setup_logger
+
+logger = setup_logger('Scheduler')
+
+
+class DeadlineScheduler:
+    """
+    Runs a callback for keys whose deadline has passed
+
+    Deadlines sit in a min-heap and a single task sleeps until the earliest
+    one, so an idle scheduler costs nothing no matter how many keys it
+    holds, and each expiry costs O(log n). Cancelling or rescheduling only
+    updates a dict; superseded heap entries are skipped when they surface,
+    and the heap is rebuilt if they start to dominate it.
+    """
+
+    # Never sleep longer than this, so wall-clock jumps are noticed eventually
+    MAX_SLEEP = 3600.0
+    RETRY_DELAY = 60.0
+
+    def __init__(self, callback, batch_size: int = 500):
+        self.callback = callback  # async callable taking a list of due keys
+        self.batch_size = batch_size
+        self._heap = []  # (deadline, key)
+        self._deadlines = {}  # key -> current deadline
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def schedule(self, key, deadline: float):
+        """Run key at deadline (wall-clock seconds), replacing any earlier schedule for it"""
+        self._deadlines[key] = deadline
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (deadline, key))
+        if earliest is None or deadline < earliest:
+            self._wake.set()
+
+    def schedule_many(self, items):
+        """Bulk schedule (key, deadline) pairs in O(n)"""
+        for key, deadline in items:
+            self._deadlines[key] = deadline
+            self._heap.append((deadline, key))
+        heapq.heapify(self._heap)
+        self._wake.set()
+
+    def cancel(self, key):
+        self._deadlines.pop(key, None)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        heap = self._heap
+        while heap and len(due) < self.batch_size:
+            deadline, key = heap[0]
+            if self._deadlines.get(key) != deadline:
+                heapq.heappop(heap)  # Cancelled or rescheduled
+                continue
+            if deadline > now:
+                break
+            heapq.heappop(heap)
+            del self._deadlines[key]
+            due.append(key)
+        if len(heap) > 2 * len(self._deadlines) + 1024:
+            self._heap = [(deadline, key) for key, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            due = self._pop_due(time.time())
+            if due:
+                try:
+                    await self.callback(due)
+                except Exception as e:
+                    logger.error(f"Scheduled callback failed for {len(due)} key(s): {e}", exc_info=True)
+                    retry_at = time.time() + self.RETRY_DELAY
+                    for key in due:
+                        if key not in self._deadlines:
+                            self.schedule(key, retry_at)
+                continue
+
+            timeout = min(self._heap[0][0] - time.time(), self.MAX_SLEEP) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def __len__(self):
+        return len(self._deadlines)
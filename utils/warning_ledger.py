@@ -0,0 +1,201 @@
+import time
+from bisect import bisect_left, insort
+from utils.logger import setup_logger
+
+logger = setup_logger('WarningLedger')
+
+WARNING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS warning_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER,
+    action TEXT NOT NULL,
+    ref_id INTEGER,
+    reason TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS warning_events_member ON warning_events (guild_id, user_id, created_at);
+CREATE INDEX IF NOT EXISTS warning_events_time ON warning_events (created_at);
+CREATE INDEX IF NOT EXISTS warning_events_ref ON warning_events (ref_id) WHERE ref_id IS NOT NULL;
+"""
+
+# A 'warn' row issues a warning; every other action revokes the warning named by ref_id
+ACTIVE_WARNINGS_SQL = """
+SELECT w.id, w.guild_id, w.user_id, w.created_at FROM warning_events w
+WHERE w.action = 'warn' AND NOT EXISTS (SELECT 1 FROM warning_events r WHERE r.ref_id = w.id)
+ORDER BY w.id
+"""
+
+
+class WarningRanking:
+    """
+    One guild's members ordered by active warning count, highest first
+
+    Entries are kept sorted as (-count, user_id), so finding a member's
+    position is a binary search and any page of the ranking is a slice.
+    Indexing and slicing yield (user_id, count).
+    """
+
+    __slots__ = ('_entries',)
+
+    def __init__(self, counts: dict = None):
+        self._entries = sorted((-count, user_id) for user_id, count in (counts or {}).items() if count)
+
+    def update(self, user_id: int, old_count: int, new_count: int):
+        if old_count:
+            del self._entries[bisect_left(self._entries, (-old_count, user_id))]
+        if new_count:
+            insort(self._entries, (-new_count, user_id))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(user_id, -count) for count, user_id in self._entries[index]]
+        count, user_id = self._entries[index]
+        return user_id, -count
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class WarningLedger:
+    """
+    Append-only warning history in SQLite with an in-memory view of active warnings
+
+    Nothing is ever updated or deleted: removewarn, clearwarns and expiry
+    append one revoking row per warning they cancel. Active warnings are
+    loaded once at startup and the cache is only changed after the matching
+    rows commit, so count lookups never touch the database and never
+    disagree with it.
+
+    Each guild also keeps a WarningRanking updated alongside its counts, so
+    warnlist pages never sort or scan the whole guild.
+
+    on_warn, if given, is called with (guild_id, user_id, warning_id,
+    created_at) for each new warning.
+    """
+
+    def __init__(self, db, on_warn=None):
+        self.db = db
+        self.on_warn = on_warn
+        self._active = {}  # guild_id -> {user_id: [(warning_id, created_at), ...]} oldest first
+        self._rankings = {}  # guild_id -> WarningRanking, kept in step with _active
+
+    async def load(self):
+        await self.db.executescript(WARNING_SCHEMA)
+        rows = await self.db.fetchall(ACTIVE_WARNINGS_SQL)
+        for warning_id, guild_id, user_id, created_at in rows:
+            self._active.setdefault(guild_id, {}).setdefault(user_id, []).append((warning_id, created_at))
+        self._rankings = {guild_id: WarningRanking(self.guild_counts(guild_id)) for guild_id in self._active}
+        logger.info(f"Loaded {len(rows)} active warning(s)")
+
+    def count(self, guild_id: int, user_id: int) -> int:
+        return len(self._active.get(guild_id, {}).get(user_id, ()))
+
+    def guild_counts(self, guild_id: int) -> dict:
+        """{user_id: active warning count} for one guild"""
+        return {user_id: len(warnings) for user_id, warnings in self._active.get(guild_id, {}).items()}
+
+    def ranking(self, guild_id: int) -> WarningRanking:
+        """The guild's live ranking of warned members; treat it as read-only"""
+        ranking = self._rankings.get(guild_id)
+        if ranking is None:
+            ranking = self._rankings[guild_id] = WarningRanking()
+        return ranking
+
+    async def warn(self, guild_id: int, user_id: int, moderator_id: int, reason: str, now: float = None) -> int:
+        """Record a warning and return the member's new active count"""
+        now = time.time() if now is None else now
+
+        def insert(conn):
+            return conn.execute(
+                "INSERT INTO warning_events (guild_id, user_id, moderator_id, action, reason, created_at) "
+                "VALUES (?, ?, ?, 'warn', ?, ?)",
+                (guild_id, user_id, moderator_id, reason, now)
+            ).lastrowid
+
+        warning_id = await self.db.run(insert)
+        warnings = self._active.setdefault(guild_id, {}).setdefault(user_id, [])
+        warnings.append((warning_id, now))
+        self.ranking(guild_id).update(user_id, len(warnings) - 1, len(warnings))
+        if self.on_warn is not None:
+            self.on_warn(guild_id, user_id, warning_id, now)
+        return len(warnings)
+
+    async def revoke(self, guild_id: int, user_id: int, moderator_id: int, action: str,
+                     amount: int = None, reason: str = None) -> int:
+        """Revoke the member's most recent `amount` active warnings (all if None), returning how many"""
+        warnings = self._active.get(guild_id, {}).get(user_id)
+        if not warnings:
+            return 0
+        revoked = warnings[-amount:] if amount is not None else list(warnings)
+        now = time.time()
+        await self.db.executemany(
+            "INSERT INTO warning_events (guild_id, user_id, moderator_id, action, ref_id, reason, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(guild_id, user_id, moderator_id, action, warning_id, reason, now) for warning_id, _ in revoked]
+        )
+        self._forget(guild_id, user_id, {warning_id for warning_id, _ in revoked})
+        return len(revoked)
+
+    def _forget(self, guild_id: int, user_id: int, warning_ids: set):
+        guild = self._active.get(guild_id, {})
+        current = guild.get(user_id, ())
+        remaining = [w for w in current if w[0] not in warning_ids]
+        self.ranking(guild_id).update(user_id, len(current), len(remaining))
+        if remaining:
+            guild[user_id] = remaining
+        else:
+            guild.pop(user_id, None)
+            if not guild:
+                self._active.pop(guild_id, None)
+
+    async def remove(self, guild_id: int, user_id: int, moderator_id: int, amount: int) -> int:
+        return await self.revoke(guild_id, user_id, moderator_id, 'remove', amount)
+
+    async def clear(self, guild_id: int, user_id: int, moderator_id: int) -> int:
+        return await self.revoke(guild_id, user_id, moderator_id, 'clear')
+
+    def active_warnings(self, guild_id: int = None):
+        """Yield (guild_id, user_id, warning_id, created_at) for active warnings, optionally for one guild"""
+        guilds = self._active.items() if guild_id is None else [(guild_id, self._active.get(guild_id, {}))]
+        for gid, members in guilds:
+            for user_id, warnings in members.items():
+                for warning_id, created_at in warnings:
+                    yield gid, user_id, warning_id, created_at
+
+    async def expire(self, warnings: list) -> int:
+        """
+        Expire (guild_id, user_id, warning_id) entries in one transaction,
+        skipping any already revoked, and return how many expired
+        """
+        due = {}
+        for guild_id, user_id, warning_id in warnings:
+            active = self._active.get(guild_id, {}).get(user_id, ())
+            if any(w[0] == warning_id for w in active):
+                due.setdefault((guild_id, user_id), set()).add(warning_id)
+        if not due:
+            return 0
+
+        now = time.time()
+        await self.db.executemany(
+            "INSERT INTO warning_events (guild_id, user_id, action, ref_id, created_at) VALUES (?, ?, 'expire', ?, ?)",
+            [(guild_id, user_id, warning_id, now) for (guild_id, user_id), ids in due.items() for warning_id in ids]
+        )
+        for (guild_id, user_id), ids in due.items():
+            self._forget(guild_id, user_id, ids)
+        return sum(len(ids) for ids in due.values())
+
+    async def history(self, guild_id: int, user_id: int, limit: int = 5) -> list:
+        """Most recent active warnings as (moderator_id, reason, created_at), newest first"""
+        return await self.db.fetchall(
+            "SELECT w.moderator_id, w.reason, w.created_at FROM warning_events w "
+            "WHERE w.guild_id = ? AND w.user_id = ? AND w.action = 'warn' "
+            "AND NOT EXISTS (SELECT 1 FROM warning_events r WHERE r.ref_id = w.id) "
+            "ORDER BY w.created_at DESC LIMIT ?",
+            (guild_id, user_id, limit)
+        )
+
+    def __len__(self):
+        """Members with at least one active warning"""
+        return sum(len(guild) for guild in self._active.values())
@@ -0,0 +1,49 @@
+from utils.guild_settings import GuildSettingsStore
+from utils.escalation import EscalationPolicy
+from utils.logger import setup_logger
+from config import WARNING_EXPIRY_DAYS, WARNING_ACTIONS
+
+logger = setup_logger('WarningSettings')
+
+WARNING_SETTINGS_FILE = "data/warnings.json"
+
+# Compiled once and shared by every guild without its own policy
+DEFAULT_POLICY = EscalationPolicy.from_config(WARNING_ACTIONS)
+
+
+class GuildWarningSettings:
+    """Warning settings for a single guild"""
+
+    __slots__ = ('expiry_days', 'policy')
+
+    def __init__(self, expiry_days=WARNING_EXPIRY_DAYS, policy=None):
+        self.expiry_days = expiry_days
+        self.policy = policy or DEFAULT_POLICY
+
+    @property
+    def expiry_seconds(self):
+        """Seconds a warning stays active, or None if warnings never expire"""
+        return self.expiry_days * 86400 if self.expiry_days else None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GuildWarningSettings':
+        policy = None
+        if 'actions' in data:
+            try:
+                policy = EscalationPolicy.from_config(data['actions'])
+            except ValueError as e:
+                logger.error(f"Ignoring invalid escalation policy {data['actions']}: {e}")
+        return cls(expiry_days=data.get('expiry_days', WARNING_EXPIRY_DAYS), policy=policy)
+
+    def to_dict(self) -> dict:
+        data = {'expiry_days': self.expiry_days}
+        if self.policy is not DEFAULT_POLICY:
+            data['actions'] = self.policy.to_dict()
+        return data
+
+
+class WarningSettingsStore(GuildSettingsStore):
+    """Per-guild warning settings, cached after first lookup and written behind"""
+
+    def __init__(self, path: str = WARNING_SETTINGS_FILE):
+        super().__init__(path, GuildWarningSettings)